@@ -0,0 +1,74 @@
+"""
+Throughput of the JSON codecs on the HTTP and WebSocket paths.
+
+Decodes a GetDeviceView response and a DEVICE_PUSH_EVENT frame and encodes a GetDeviceView request body with every
+installed codec. Recorded payloads can be used with --payload (raw GetDeviceView response) and --ws-payload (raw
+WebSocket frame).
+
+    python -m scripts.bench_codec [--payload recorded.json] [--ws-payload frame.json] [--registers 600]
+"""
+import argparse
+import json
+import timeit
+
+from systemair.saveconnect import codec
+from systemair.saveconnect.const import APIRoutes
+
+from .payloads import load_device_view
+
+
+def push_event(view: bytes, n_items=20) -> bytes:
+    data_items = json.loads(view)["data"]["GetDeviceView"]["dataItems"][:n_items]
+    return json.dumps({
+        "type": "DEVICE_PUSH_EVENT",
+        "payload": {"deviceId": "IAM_0000000000000000", "dataItems": data_items}
+    }).encode()
+
+
+def view_request() -> dict:
+    return dict(
+        query="mutation ($input: GetDeviceViewInput!) { GetDeviceView(input: $input) { route dataItems } }",
+        variables=dict(input=dict(deviceId="IAM_0000000000000000", route=APIRoutes.HOME))
+    )
+
+
+def installed_codecs():
+    for name, cls in codec.CODECS.items():
+        try:
+            yield cls()
+        except ImportError:
+            print(f"{name}: not installed")
+
+
+def per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload", default=None)
+    parser.add_argument("--ws-payload", default=None)
+    parser.add_argument("--registers", type=int, default=600)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    view = load_device_view(args.payload, args.registers)
+    if args.ws_payload:
+        with open(args.ws_payload, "rb") as f:
+            frame = f.read()
+    else:
+        frame = push_event(view)
+    frame_text = frame.decode()
+    request = view_request()
+
+    print(f"view {len(view):,} bytes, ws frame {len(frame):,} bytes")
+    print(f"{'codec':<10}{'view loads us':>16}{'ws loads us':>14}{'request dumps us':>18}")
+    for c in installed_codecs():
+        loads_view = per_call(lambda: c.loads(view), args.number)
+        loads_frame = per_call(lambda: c.loads(frame_text), args.number * 10)
+        dumps_request = per_call(lambda: c.dumps(request), args.number * 10)
+        print(f"{c.name:<10}{loads_view * 1e6:>16,.1f}{loads_frame * 1e6:>14,.1f}{dumps_request * 1e6:>18,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Event loop latency while large responses are parsed.
+
+Polls the GetAccount query and the home view of many devices against a local stand-in gateway, first with
+every response decoded on the loop and then with responses above the offload threshold decoded in a thread pool and
+in a process pool.
+A monitor task measures how late the loop wakes it up, which is the delay WebSocket pings and other I/O would see.
+
+    python -m scripts.bench_loop_latency [--devices 20] [--rounds 5] [--notifications 5000] [--codec json]
+                                         [--threshold 65536] [--payload recorded.json]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import time
+
+from systemair.saveconnect.const import APIRoutes
+from systemair.saveconnect.systemair import SaveConnect
+
+from .payloads import account_response, load_device_view
+from .standin_server import StandInGraphQLServer
+
+
+async def monitor(lags, interval=0.001):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(threshold, executor, args, view, account):
+    server = await StandInGraphQLServer(
+        lambda request, headers: account if "GetAccount" in request["query"] else view
+    ).start()
+    sc = SaveConnect("bench@example.com", "", ws_enabled=False, update_interval=0, refresh_token_interval=0,
+                     loop=asyncio.get_event_loop(), json_codec=args.codec, parse_offload_threshold=threshold)
+    sc.graphql.api_url = server.url
+    sc.graphql.set_access_token({"access_token": "bench"})
+    sc.graphql.skip_unchanged = False
+    sc.graphql.executor = executor
+
+    # The first request imports and sets up the HTTP stack, which is not what is measured.
+    await sc.graphql.post(server.url, dict(query="{ warmup }"), sc.graphql.headers)
+
+    lags = []
+    task = asyncio.ensure_future(monitor(lags))
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        devices = await sc.get_devices(fetch_device_info=False)
+        # Devices are polled one after the other, as the worker does.
+        for device in devices:
+            await sc.graphql.queryDeviceView(device.identifier, APIRoutes.HOME)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    await server.close()
+
+    lags.sort()
+    return elapsed, lags[int(len(lags) * 0.99)], lags[-1], sc.graphql.stats.offloaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--registers", type=int, default=600)
+    parser.add_argument("--payload", default=None)
+    parser.add_argument("--threshold", type=int, default=65536)
+    parser.add_argument("--codec", default=None)
+    args = parser.parse_args()
+
+    view = load_device_view(args.payload, args.registers)
+    account = account_response(args.devices, args.notifications)
+    print(f"view {len(view):,} bytes, account {len(account):,} bytes, {args.devices} devices, {args.rounds} rounds")
+    print(f"{'decoding':<20}{'total s':>9}{'p99 lag ms':>12}{'max lag ms':>12}{'offloaded':>11}")
+    with concurrent.futures.ProcessPoolExecutor(1) as processes:
+        for label, threshold, executor in [
+            ("on the loop", None, None),
+            ("thread pool", args.threshold, None),
+            ("process pool", args.threshold, processes),
+        ]:
+            elapsed, p99, worst, offloaded = asyncio.get_event_loop().run_until_complete(
+                run(threshold, executor, args, view, account)
+            )
+            print(f"{label:<20}{elapsed:>9.2f}{p99 * 1e3:>12.1f}{worst * 1e3:>12.1f}{offloaded:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Bytes transferred per query type with the full and the light selection sets, with and without gzip.
+
+Polls the account and the home view of every device against a local stand-in gateway that only returns the fields
+a query selects, and prints the traffic counters of SaveConnectGraphQLStats. The synthetic view has an empty layout,
+so record a real response with --payload to see what the view selection saves.
+
+    python -m scripts.bench_payload_size [--devices 20] [--rounds 5] [--notifications 5000] [--payload recorded.json]
+"""
+import argparse
+import asyncio
+import json
+
+from systemair.saveconnect.const import APIRoutes
+from systemair.saveconnect.queries import AccountSelection, ViewSelection
+from systemair.saveconnect.systemair import SaveConnect
+
+from .payloads import account_response, load_device_view
+from .standin_server import StandInGraphQLServer
+
+
+def selected(response: bytes, field: str, query: str) -> bytes:
+    """
+    @return: the response reduced to the fields of data[field] named in the query, and for GetAccount also to the
+    named fields of its devices and notifications. dataItems and elements are JSON scalars and kept whole.
+    """
+    data = json.loads(response)
+    words = set(query.replace("{", " ").replace("}", " ").split())
+
+    def select(value):
+        if isinstance(value, list):
+            return [select(item) for item in value]
+        if isinstance(value, dict):
+            return {key: item for key, item in value.items() if key in words}
+        return value
+
+    data["data"][field] = select(data["data"][field])
+    if field == "GetAccount":
+        data["data"][field] = {key: select(value) for key, value in data["data"][field].items()}
+    return json.dumps(data).encode()
+
+
+def gateway(account, view):
+    responses = dict()
+
+    def handle(request, headers):
+        query = request["query"]
+        if query not in responses:
+            field = "GetAccount" if "GetAccount" in query else "GetDeviceView"
+            responses[query] = selected(account if field == "GetAccount" else view, field, query)
+        return responses[query]
+
+    return handle
+
+
+async def run(args, handler, light, compress):
+    server = await StandInGraphQLServer(handler, compress=compress).start()
+    sc = SaveConnect("bench@example.com", "", ws_enabled=False, update_interval=0, refresh_token_interval=0,
+                     loop=asyncio.get_event_loop())
+    sc.graphql.api_url = server.url
+    sc.graphql.set_access_token({"access_token": "bench"})
+    sc.graphql.skip_unchanged = False
+    if not light:
+        sc.graphql.view_selection = ViewSelection.FULL
+        sc.graphql.account_selection = AccountSelection.FULL
+
+    for _ in range(args.rounds):
+        devices = await sc.get_devices(fetch_device_info=False)
+        for device in devices:
+            await sc.graphql.queryDeviceView(device.identifier, APIRoutes.HOME)
+    await server.close()
+    return sc.graphql.stats.dict()["traffic"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--registers", type=int, default=600)
+    parser.add_argument("--payload", default=None)
+    args = parser.parse_args()
+
+    handler = gateway(account_response(args.devices, args.notifications), load_device_view(args.payload, args.registers))
+    print(f"{args.devices} devices, {args.notifications} notifications, {args.rounds} rounds, bytes per request")
+    print(f"{'selection':<10}{'gzip':<6}{'operation':<18}{'sent':>8}{'received':>12}{'decoded':>12}")
+    for light in (False, True):
+        for compress in (False, True):
+            traffic = asyncio.get_event_loop().run_until_complete(run(args, handler, light, compress))
+            for operation, counters in traffic.items():
+                requests = counters["requests"]
+                print(f"{'light' if light else 'full':<10}{'yes' if compress else 'no':<6}{operation:<18}"
+                      f"{counters['sent'] // requests:>8,}{counters['received'] // requests:>12,}"
+                      f"{counters['decoded'] // requests:>12,}")
+
+
+if __name__ == "__main__":
+    main()
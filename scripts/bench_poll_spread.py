@@ -0,0 +1,67 @@
+"""
+Request rate of a fleet of clients that are deployed at the same time.
+
+Simulates clients that each start within the same second and run the worker loop over their devices with a
+SaveConnectScheduler. Without spreading, every client polls one interval after its previous poll, so the fleet keeps
+hitting the gateway in the same second. With spreading every (device, route) pair polls at its own hashed phase. As
+the worker only wakes up every worker_interval, the offset variant also starts the worker loop at a random point of
+its first interval. Reports the peak and 99th percentile of requests per second.
+
+    python -m scripts.bench_poll_spread [--clients 200] [--devices 2] [--duration 3600] [--jitter 0]
+"""
+import argparse
+import collections
+import random
+
+from systemair.saveconnect.planner import DEFAULT_ROUTES
+from systemair.saveconnect.poll import PollRule, SaveConnectPollPolicy, SaveConnectScheduler
+
+
+def simulate(n_clients, n_devices, duration, worker_interval, spread, jitter, offset=False, seed=0):
+    rng = random.Random(seed)
+    policy = SaveConnectPollPolicy([PollRule("*", 60, jitter=jitter)])
+    per_second = collections.Counter()
+
+    clients = []
+    for c in range(n_clients):
+        scheduler = SaveConnectScheduler(policy, spread=spread)
+        devices = [f"{c:04x}{d:04x}{rng.getrandbits(64):016x}" for d in range(n_devices)]
+        start = rng.random() * (worker_interval if offset else 1)
+        clients.append((start, scheduler, devices))
+
+    for tick in range(0, duration, worker_interval):
+        for start, scheduler, devices in clients:
+            now = start + tick
+            for device_id in devices:
+                for route in scheduler.due(device_id, DEFAULT_ROUTES, now):
+                    per_second[int(now)] += 1
+                    scheduler.mark(device_id, route, now)
+
+    rates = sorted(per_second.get(second, 0) for second in range(duration))
+    return sum(rates), rates[-1], rates[int(len(rates) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=2)
+    parser.add_argument("--duration", type=int, default=3600)
+    parser.add_argument("--worker-interval", type=int, default=5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'schedule':<26}{'requests':>10}{'peak req/s':>12}{'p99 req/s':>12}")
+    for label, spread, jitter, offset in [
+        ("interval", False, 0.0, False),
+        ("interval + jitter", False, args.jitter or 5.0, False),
+        ("hashed phase", True, 0.0, False),
+        ("hashed phase + jitter", True, args.jitter or 5.0, False),
+        ("hashed phase + offset", True, 0.0, True),
+    ]:
+        total, peak, p99 = simulate(args.clients, args.devices, args.duration, args.worker_interval, spread, jitter,
+                                    offset)
+        print(f"{label:<26}{total:>10,}{peak:>12,}{p99:>12,}")
+
+
+if __name__ == "__main__":
+    main()
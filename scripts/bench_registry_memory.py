@@ -0,0 +1,94 @@
+"""
+Memory footprint of a device registry.
+
+Compares the previous registry layout (a pydantic model with a field for every known register, fully parsed on
+every update) with the sparse SaveConnectRegistry, which stores value slots pointing at interned metadata.
+Reports the retained memory per device and the memory allocated by a repeated poll of the same device.
+
+    python -m scripts.bench_registry_memory [--devices 500] [--registers 600] [--payload recorded.json]
+"""
+import argparse
+import json
+import tracemalloc
+import typing
+
+import pydantic
+
+from systemair.saveconnect.metadata import SaveConnectMetadataCache
+from systemair.saveconnect.models import SaveConnectRegisterItem, update
+from systemair.saveconnect.register import Register, SaveConnectRegistry
+
+from .payloads import load_device_view
+
+
+LegacyRegistry = pydantic.create_model(
+    "LegacyRegistry",
+    **{name: (typing.Optional[SaveConnectRegisterItem], None) for name in sorted(SaveConnectRegistry.names)}
+)
+
+
+def poll_legacy(registry, data_items):
+    update(registry, {
+        Register.map[str(x["register"])]: SaveConnectRegisterItem.parse_obj(x)
+        for x in data_items if str(x["register"]) in Register.map
+    })
+    return registry
+
+
+def poll_sparse(registry, data_items):
+    registry.ingest({
+        Register.map[str(x["register"])]: x
+        for x in data_items if str(x["register"]) in Register.map
+    })
+    return registry
+
+
+def data_items(payload):
+    return json.loads(payload)["data"]["GetDeviceView"]["dataItems"]
+
+
+def measure_retained(factory, poll, n_devices, payload):
+    tracemalloc.start()
+    registries = []
+    for _ in range(n_devices):
+        # Every device gets its own decoded payload, as it does when polling.
+        registries.append(poll(factory(), data_items(payload)))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / n_devices
+
+
+def measure_poll(factory, poll, n_polls, payload):
+    registry = poll(factory(), data_items(payload))
+    decoded = [data_items(payload) for _ in range(n_polls)]
+
+    tracemalloc.start()
+    for items in decoded:
+        poll(registry, items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--registers", type=int, default=600)
+    parser.add_argument("--payload", default=None)
+    args = parser.parse_args()
+
+    payload = load_device_view(args.payload, args.registers)
+    cache = SaveConnectMetadataCache()
+
+    print(f"{'layout':<28}{'retained bytes/device':>24}{'peak bytes/poll':>18}")
+    for label, factory, poll in [
+        ("legacy pydantic registry", LegacyRegistry, poll_legacy),
+        ("sparse registry", lambda: SaveConnectRegistry(cache=cache), poll_sparse),
+    ]:
+        retained = measure_retained(factory, poll, args.devices, payload)
+        peak = measure_poll(factory, poll, 10, payload)
+        print(f"{label:<28}{retained:>24,.0f}{peak:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Throughput of applying a polled GetDeviceView response to a device registry.
+
+Compares the dict path (decode the whole response, then SaveConnectData.update) with the typed path
+(SaveConnectViewDecoder.decode_values, then SaveConnectData.update_values) on a device whose registers are already known, i.e. the
+steady state of polling. Requires msgspec.
+
+    python -m scripts.bench_typed_decode [--registers 600] [--payload recorded.json]
+"""
+import argparse
+import json
+import timeit
+
+from systemair.saveconnect.codec import get_codec
+from systemair.saveconnect.data import SaveConnectData
+from systemair.saveconnect.typed import SaveConnectViewDecoder
+
+from .payloads import load_device_view
+
+DEVICE = {
+    "identifier": "IAM_0000000000000000",
+    "name": "bench",
+    "connectionStatus": "ONLINE",
+    "units": {"temperature": "celsius", "pressure": "pascal", "flow": "l/s"},
+}
+
+
+def polled(data, payload):
+    data.update_device(DEVICE)
+    data.update(DEVICE["identifier"], json.loads(payload)["data"])
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registers", type=int, default=600)
+    parser.add_argument("--payload", default=None)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = load_device_view(args.payload, args.registers)
+    device_id = DEVICE["identifier"]
+    decoder = SaveConnectViewDecoder()
+
+    def dict_path(codec):
+        data = polled(SaveConnectData(), payload)
+        return lambda: data.update(device_id, codec.loads(payload)["data"])
+
+    def typed_path():
+        data = polled(SaveConnectData(), payload)
+        return lambda: data.update_values(device_id, decoder.decode_values(payload)[1])
+
+    print(f"{len(payload):,} bytes, {len(json.loads(payload)['data']['GetDeviceView']['dataItems'])} dataItems")
+    print(f"{'path':<28}{'us/poll':>10}{'polls/s':>10}")
+    for label, fn in [
+        ("dict, json", dict_path(get_codec("json"))),
+        ("dict, fastest codec", dict_path(get_codec())),
+        ("typed msgspec", typed_path()),
+    ]:
+        per_call = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{label:<28}{per_call * 1e6:>10,.0f}{1 / per_call:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
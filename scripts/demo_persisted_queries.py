@@ -0,0 +1,105 @@
+"""
+Automatic persisted queries against local stand-in gateways.
+
+Polls the account and the home view of a few devices with sc.graphql.persisted_queries enabled, once against a
+gateway that supports persisted queries, once against one that answers hash-only requests with
+PersistedQueryNotSupported, and once against one that requires the query text like a server without the extension.
+Prints the requests and request bytes each gateway received and the persisted query counters of the client. --full
+polls with the full selection sets, whose documents are longer than the persisted query extension.
+
+    python -m scripts.demo_persisted_queries [--devices 5] [--rounds 10] [--full]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+
+from systemair.saveconnect.const import APIRoutes
+from systemair.saveconnect.queries import AccountSelection, ViewSelection
+from systemair.saveconnect.systemair import SaveConnect
+
+from .payloads import account_response, load_device_view
+from .standin_server import StandInGraphQLServer
+
+
+def error(message, code=None) -> bytes:
+    return json.dumps({"data": None, "errors": [{"message": message, "extensions": {"code": code}}]}).encode()
+
+
+class PersistedQueryServer(StandInGraphQLServer):
+
+    def __init__(self, handler, mode="supported"):
+        """
+        @param mode: supported, not_supported (answers PersistedQueryNotSupported) or unaware (requires the query text)
+        """
+        super().__init__(handler)
+        self.mode = mode
+        self.documents = dict()
+
+    def _respond(self, request, headers):
+        persisted = (request.get("extensions") or {}).get("persistedQuery")
+        query = request.get("query")
+        if persisted and self.mode == "not_supported":
+            return error("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED"), {}
+        if persisted and self.mode == "supported":
+            digest = persisted["sha256Hash"]
+            if query is None:
+                if digest not in self.documents:
+                    return error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND"), {}
+                query = self.documents[digest]
+            elif hashlib.sha256(query.encode()).hexdigest() != digest:
+                return error("provided sha does not match query", "INTERNAL_SERVER_ERROR"), {}
+            self.documents[digest] = query
+        if query is None:
+            return error("Must provide query string."), {}
+        return self.handler(dict(request, query=query), headers), {}
+
+
+async def run(args, mode, account, view):
+    server = await PersistedQueryServer(
+        lambda request, headers: account if "GetAccount" in request["query"] else view, mode=mode
+    ).start()
+    sc = SaveConnect("demo@example.com", "", ws_enabled=False, update_interval=0, refresh_token_interval=0,
+                     loop=asyncio.get_event_loop())
+    sc.graphql.api_url = server.url
+    sc.graphql.set_access_token({"access_token": "demo"})
+    sc.graphql.persisted_queries = mode is not None
+    if args.full:
+        sc.graphql.view_selection = ViewSelection.FULL
+        sc.graphql.account_selection = AccountSelection.FULL
+
+    polls = 0
+    for _ in range(args.rounds):
+        devices = await sc.get_devices(fetch_device_info=False)
+        for device in devices:
+            polls += await sc.graphql.queryDeviceView(device.identifier, APIRoutes.HOME)
+    await server.close()
+    stats = sc.graphql.stats
+    return server, polls, stats.persisted_hits, stats.persisted_misses, sc.graphql.persisted_queries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--full", action="store_true")
+    args = parser.parse_args()
+
+    account = account_response(args.devices, 0)
+    view = load_device_view(None, 50)
+    print(f"{'gateway':<16}{'polls':>7}{'requests':>10}{'bytes in':>10}{'hits':>6}{'misses':>8}{'enabled':>9}")
+    for label, mode in [
+        ("no APQ client", None),
+        ("supported", "supported"),
+        ("not supported", "not_supported"),
+        ("unaware", "unaware"),
+    ]:
+        server, polls, hits, misses, enabled = asyncio.get_event_loop().run_until_complete(
+            run(args, mode, account, view)
+        )
+        print(f"{label:<16}{polls:>7}{server.requests:>10}{server.bytes_in:>10,}{hits:>6}{misses:>8}"
+              f"{str(enabled):>9}")
+
+
+if __name__ == "__main__":
+    main()
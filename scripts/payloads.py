@@ -0,0 +1,82 @@
+"""
+Payloads for the benchmark scripts.
+
+Recorded responses can be used by pointing load_device_view() at a JSON file containing a raw GetDeviceView
+response. Without a recording a synthetic response shaped like the /device/home view is generated.
+"""
+import json
+import random
+
+from systemair.saveconnect.register import Register
+
+
+def synthetic_data_item(register, rng):
+    value = rng.randint(0, 400)
+    return {
+        "register": register,
+        "defaultValue": value,
+        "options": None,
+        "readOnly": rng.random() < 0.5,
+        "type": 1,
+        "value": value,
+        "internalDeviceType": 1,
+        "min": 0,
+        "max": 1000,
+        "decimals": rng.choice([0, 1]),
+        "increment": 1,
+        "exportable": True,
+        "conditionalProperties": []
+    }
+
+
+def synthetic_device_view(n_registers=600, seed=0, route="/device/home"):
+    rng = random.Random(seed)
+    registers = sorted(int(r) for r in Register.map)[:n_registers]
+    return {
+        "data": {
+            "GetDeviceView": {
+                "route": route,
+                "elements": [],
+                "dataItems": [synthetic_data_item(r, rng) for r in registers],
+                "title": "Home",
+                "translationVariables": {}
+            }
+        }
+    }
+
+
+def account_response(n_devices=20, n_notifications=5000) -> bytes:
+    """
+    @return: a synthetic raw GetAccount response with its devices and notifications
+    """
+    return json.dumps({"data": {"GetAccount": {
+        "email": "bench@example.com",
+        "devices": [{
+            "name": f"device {i}",
+            "identifier": f"IAM_{i:016d}",
+            "connectionStatus": "ONLINE",
+            "units": {"temperature": "celsius", "pressure": "pascal", "flow": "l/s"},
+        } for i in range(n_devices)],
+        "notifications": [{
+            "id": f"{i:08d}",
+            "title": "Filter change",
+            "description": "The filter should be changed within 30 days. " * 4,
+            "type": "ALARM",
+            "unread": i % 10 == 0,
+            "email": True,
+            "properties": {"deviceId": f"IAM_{i % n_devices:016d}", "alarm": "FILTER_WARNING"},
+            "createdAt": "2023-01-01T00:00:00.000Z",
+        } for i in range(n_notifications)],
+    }}}).encode()
+
+
+def load_device_view(path=None, n_registers=600):
+    """
+    @param path: optional path to a recorded raw GetDeviceView response
+    @param n_registers: number of registers of the synthetic response
+    @return: the response as raw bytes
+    """
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    return json.dumps(synthetic_device_view(n_registers)).encode()
@@ -0,0 +1,76 @@
+"""
+Local stand-in for the SaveConnect GraphQL gateway, for the benchmark and demo scripts.
+
+A minimal HTTP/1.1 server on asyncio streams with keep-alive. Every POST body is decoded as JSON and passed to a
+handler that returns the response body. Responses are gzip compressed when compress is set and the client accepts
+gzip. Request and response sizes are counted as sent on the wire.
+"""
+import asyncio
+import gzip
+import json
+import typing
+
+
+class StandInGraphQLServer:
+
+    def __init__(self, handler: typing.Callable[[dict, dict], bytes], host="127.0.0.1", port=0, compress=False):
+        """
+        @param handler: called as handler(request, headers) with the decoded request body and the lower case request
+        headers, returns the raw JSON response body
+        """
+        self.handler = handler
+        self.compress = compress
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/gateway/api"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                headers = dict(
+                    (key.strip().lower(), value.strip())
+                    for key, _, value in (line.partition(":") for line in lines[1:] if line)
+                )
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                self.bytes_in += len(head) + len(body)
+
+                content, extra_headers = self._respond(json.loads(body), headers)
+                if self.compress and "gzip" in headers.get("accept-encoding", ""):
+                    content = gzip.compress(content, compresslevel=6)
+                    extra_headers = dict(extra_headers, **{"content-encoding": "gzip"})
+                response = (
+                    "HTTP/1.1 200 OK\r\n"
+                    "content-type: application/json\r\n"
+                    f"content-length: {len(content)}\r\n"
+                    + "".join(f"{key}: {value}\r\n" for key, value in extra_headers.items())
+                    + "\r\n"
+                ).encode() + content
+                self.bytes_out += len(response)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, request, headers) -> typing.Tuple[bytes, dict]:
+        return self.handler(request, headers), {}
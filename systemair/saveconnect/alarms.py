@@ -0,0 +1,141 @@
+"""
+Active alarm index.
+
+The REG_ALARM_<NAME>_ALARM, _ERROR, _CLEAR_ALARM and _TIMESTAMP_L registers are grouped into alarm families once at
+import. SaveConnectAlarms is a SaveConnectData sink that only looks at updates of the _ALARM registers, keeps the
+set of active alarms per device and fleet-wide, and reports raised and cleared alarms to its callbacks.
+"""
+import logging
+import re
+import typing
+
+from .register import Register
+
+_LOGGER = logging.getLogger(__name__)
+
+_ALARM_REGISTER = re.compile(r"^REG_ALARM_(\w+?)_(CLEAR_ALARM|ALARM|ERROR|TIMESTAMP_L)$")
+
+
+class AlarmFamily(typing.NamedTuple):
+    name: str
+    alarm: typing.Optional[int]
+    error: typing.Optional[int]
+    clear: typing.Optional[int]
+    timestamp: typing.Optional[int]
+
+
+def _index_families() -> typing.Dict[str, AlarmFamily]:
+    registers: typing.Dict[str, typing.Dict[str, int]] = dict()
+    for name, address in vars(Register).items():
+        match = _ALARM_REGISTER.match(name)
+        if match:
+            registers.setdefault(match.group(1), {})[match.group(2)] = address
+    return {
+        family: AlarmFamily(family, r.get("ALARM"), r.get("ERROR"), r.get("CLEAR_ALARM"), r.get("TIMESTAMP_L"))
+        for family, r in registers.items()
+    }
+
+
+"""All alarm families by name, e.g. ALARM_FAMILIES["FILTER_WARNING"]"""
+ALARM_FAMILIES = _index_families()
+
+"""Alarm families by the address of their _ALARM register"""
+ALARM_REGISTERS = {family.alarm: family for family in ALARM_FAMILIES.values() if family.alarm is not None}
+
+
+class ActiveAlarm(typing.NamedTuple):
+    device_id: str
+    family: str
+    value: typing.Any
+    raised_at: float
+
+
+class AlarmEvent(typing.NamedTuple):
+    device_id: str
+    family: str
+    raised: bool
+    value: typing.Any
+    timestamp: float
+
+
+def alarm_is_active(value) -> bool:
+    """
+    Default interpretation of an _ALARM register value: anything but 0 is active
+    """
+    try:
+        return int(value) != 0
+    except (TypeError, ValueError):
+        return False
+
+
+class SaveConnectAlarms:
+
+    def __init__(self, data, is_active: typing.Callable[[typing.Any], bool] = alarm_is_active):
+        """
+        Active alarm index. Indexes the current registry values and adds itself as a sink of data.
+        @param data: the SaveConnectData
+        @param is_active: function deciding whether an _ALARM register value means the alarm is active
+        """
+        self.data = data
+        self.is_active = is_active
+        self.callbacks: typing.List[typing.Callable] = []
+
+        self._active: typing.Dict[str, typing.Dict[str, ActiveAlarm]] = dict()
+        self._fleet: typing.Dict[typing.Tuple[str, str], ActiveAlarm] = dict()
+
+        for device_id, device in list(data.devices.items()):
+            if device.registry is None:
+                continue
+            for _, slot in device.registry.items():
+                family = ALARM_REGISTERS.get(slot.register_)
+                if family is not None:
+                    self._apply(device_id, family, slot.value, slot.updated_at)
+        data.add_sink(self)
+
+    def add_callback(self, cb):
+        """
+        Register a callback that is called as cb(event) for every raised or cleared AlarmEvent.
+        Coroutine functions are scheduled through the SaveConnectData dispatcher.
+        """
+        self.callbacks.append(cb)
+
+    def on_update(self, device_id, changes, timestamp, source):
+        events = []
+        for change in changes:
+            family = ALARM_REGISTERS.get(change.register)
+            if family is not None and change.changed:
+                event = self._apply(device_id, family, change.new, timestamp)
+                if event is not None:
+                    events.append(event)
+
+        if events and self.callbacks:
+            self.data.dispatcher.dispatch(self.callbacks, [(event,) for event in events])
+
+    def active(self, device_id=None) -> typing.List[ActiveAlarm]:
+        """
+        @param device_id: optional device. Returns the active alarms of the whole fleet if None
+        @return: the active alarms
+        """
+        if device_id is None:
+            return list(self._fleet.values())
+        return list(self._active.get(device_id, {}).values())
+
+    def is_raised(self, device_id, family) -> bool:
+        return family in self._active.get(device_id, {})
+
+    def _apply(self, device_id, family: AlarmFamily, value, timestamp) -> typing.Optional[AlarmEvent]:
+        device_alarms = self._active.setdefault(device_id, {})
+        was_active = family.name in device_alarms
+
+        if self.is_active(value):
+            raised_at = device_alarms[family.name].raised_at if was_active else timestamp
+            alarm = ActiveAlarm(device_id, family.name, value, raised_at)
+            device_alarms[family.name] = alarm
+            self._fleet[(device_id, family.name)] = alarm
+            return None if was_active else AlarmEvent(device_id, family.name, True, value, timestamp)
+
+        if was_active:
+            del device_alarms[family.name]
+            del self._fleet[(device_id, family.name)]
+            return AlarmEvent(device_id, family.name, False, value, timestamp)
+        return None
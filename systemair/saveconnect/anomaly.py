@@ -0,0 +1,108 @@
+"""
+Streaming anomaly detection on register values.
+
+SaveConnectAnomalyDetector is a SaveConnectData sink keeping an exponentially weighted mean and variance per device
+and register in typed arrays, i.e. constant memory per register. A value whose z-score against the statistics so
+far exceeds the threshold is reported as an AnomalyEvent to the detector callbacks.
+"""
+import logging
+import math
+import typing
+from array import array
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AnomalyEvent(typing.NamedTuple):
+    device_id: str
+    register: int
+    name: str
+    value: float
+    mean: float
+    std: float
+    zscore: float
+    timestamp: float
+
+
+class SaveConnectAnomalyDetector:
+
+    def __init__(self, data, alpha=0.05, threshold=4.0, warmup=30, min_std=1.0, registers=None):
+        """
+        EWMA z-score detector. Adds itself as a sink of data.
+        @param data: the SaveConnectData
+        @param alpha: weight of a new sample in the moving mean and variance
+        @param threshold: absolute z-score above which a sample is reported
+        @param warmup: number of samples per register before anything is reported
+        @param min_std: lower bound of the standard deviation (raw register units), avoids reports on flat signals
+        @param registers: optional collection of register addresses to watch. Watches all numeric registers if None
+        """
+        self.data = data
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_std = min_std
+        self.registers = frozenset(int(r) for r in registers) if registers is not None else None
+
+        self.callbacks: typing.List[typing.Callable] = []
+        self.events = 0
+
+        self._index: typing.Dict[typing.Tuple[str, int], int] = dict()
+        self._mean = array("d")
+        self._var = array("d")
+        self._count = array("L")
+
+        data.add_sink(self)
+
+    def add_callback(self, cb):
+        """
+        Register a callback that is called as cb(event) for every AnomalyEvent.
+        Coroutine functions are scheduled through the SaveConnectData dispatcher.
+        """
+        self.callbacks.append(cb)
+
+    def on_update(self, device_id, changes, timestamp, source):
+        events = []
+        index = self._index
+        mean, var, count = self._mean, self._var, self._count
+        alpha = self.alpha
+
+        for change in changes:
+            if self.registers is not None and change.register not in self.registers:
+                continue
+            try:
+                value = float(change.new)
+            except (TypeError, ValueError):
+                continue
+
+            i = index.get((device_id, change.register))
+            if i is None:
+                i = index[(device_id, change.register)] = len(mean)
+                mean.append(value)
+                var.append(0.0)
+                count.append(1)
+                continue
+
+            diff = value - mean[i]
+            std = max(math.sqrt(var[i]), self.min_std)
+            if count[i] >= self.warmup and abs(diff) > self.threshold * std:
+                events.append(AnomalyEvent(device_id, change.register, change.name, value, mean[i], std,
+                                           diff / std, timestamp))
+
+            increment = alpha * diff
+            mean[i] += increment
+            var[i] = (1 - alpha) * (var[i] + diff * increment)
+            count[i] += 1
+
+        if events:
+            self.events += len(events)
+            if self.callbacks:
+                self.data.dispatcher.dispatch(self.callbacks, [(event,) for event in events])
+
+    def statistics(self, device_id, register) -> typing.Optional[typing.Tuple[float, float, int]]:
+        """
+        @return: (mean, std, samples) of a register, None if it has not been seen
+        """
+        i = self._index.get((device_id, int(register)))
+        if i is None:
+            return None
+        return self._mean[i], math.sqrt(self._var[i]), self._count[i]
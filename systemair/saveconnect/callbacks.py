@@ -0,0 +1,160 @@
+"""
+Dispatching of device update callbacks.
+
+Plain functions are called inline, coroutine functions are scheduled on the event loop with a bound on how many
+run concurrently. Every call is timed against a budget so that slow consumers can be spotted. Coroutine callbacks
+that run past timeout_factor times their budget are cancelled, so a hanging consumer cannot hold a slot forever.
+"""
+import asyncio
+import logging
+import time
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SaveConnectCallbackStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.overruns = 0
+        self.consecutive_overruns = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "consecutive_overruns": self.consecutive_overruns,
+            "dropped": self.dropped,
+            "timeouts": self.timeouts,
+            "total_time": self.total_time,
+            "max_time": self.max_time
+        }
+
+
+class SaveConnectCallbackDispatcher:
+
+    def __init__(self, loop=None, max_concurrency=8, max_pending=256, budget=0.5, slow_after=3, timeout_factor=4.0):
+        """
+        Dispatcher for update callbacks
+        @param loop: the asyncio loop coroutine callbacks are scheduled on. Defaults to the current loop
+        @param max_concurrency: maximum number of coroutine callbacks running at the same time
+        @param max_pending: maximum number of scheduled batches before new batches are dropped
+        @param budget: default time budget (seconds) of a single callback call
+        @param slow_after: number of consecutive budget overruns before a callback is reported as slow
+        @param timeout_factor: coroutine callback calls are cancelled after timeout_factor times their budget. None
+        never cancels them
+        """
+        self.loop = loop
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.budget = budget
+        self.slow_after = slow_after
+        self.timeout_factor = timeout_factor
+
+        self.stats: typing.Dict[typing.Callable, SaveConnectCallbackStats] = dict()
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    def dispatch(self, callbacks, items, budgets=None):
+        """
+        Deliver a batch of updates to each callback
+        @param callbacks: list of callbacks
+        @param items: list of argument tuples, one call is made per tuple
+        @param budgets: optional mapping of callback to its own time budget
+        """
+        budgets = budgets or {}
+        for cb in callbacks:
+            budget = budgets.get(cb, self.budget)
+            if asyncio.iscoroutinefunction(cb):
+                self._schedule(cb, items, budget)
+            else:
+                for args in items:
+                    start = time.perf_counter()
+                    try:
+                        cb(*args)
+                    except Exception:
+                        self._stats(cb).errors += 1
+                        _LOGGER.exception(f"Update callback {self._name(cb)} failed.")
+                    self._account(cb, time.perf_counter() - start, budget)
+
+    def slow_callbacks(self) -> typing.List[typing.Callable]:
+        """
+        @return: callbacks that are currently exceeding their budget on a regular basis
+        """
+        return [cb for cb, stats in self.stats.items() if stats.consecutive_overruns >= self.slow_after]
+
+    @property
+    def pending(self):
+        return len(self._tasks)
+
+    async def drain(self):
+        """
+        Wait for all scheduled callbacks to finish
+        """
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _schedule(self, cb, items, budget):
+        if len(self._tasks) >= self.max_pending:
+            self._stats(cb).dropped += len(items)
+            _LOGGER.warning(f"Dropping {len(items)} updates for callback {self._name(cb)}. "
+                            f"{len(self._tasks)} callback batches are already pending.")
+            return
+
+        loop = self.loop or asyncio.get_event_loop()
+        task = loop.create_task(self._run(cb, items, budget))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, cb, items, budget):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        timeout = None
+        if budget is not None and self.timeout_factor is not None:
+            timeout = budget * self.timeout_factor
+
+        async with self._semaphore:
+            for args in items:
+                start = time.perf_counter()
+                try:
+                    await asyncio.wait_for(cb(*args), timeout)
+                except asyncio.TimeoutError:
+                    self._stats(cb).timeouts += 1
+                    _LOGGER.warning(f"Update callback {self._name(cb)} was cancelled after {timeout:.3f}s.")
+                except Exception:
+                    self._stats(cb).errors += 1
+                    _LOGGER.exception(f"Update callback {self._name(cb)} failed.")
+                self._account(cb, time.perf_counter() - start, budget)
+
+    def _account(self, cb, elapsed, budget):
+        stats = self._stats(cb)
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+
+        if budget is None or elapsed <= budget:
+            stats.consecutive_overruns = 0
+            return
+
+        stats.overruns += 1
+        stats.consecutive_overruns += 1
+        if stats.consecutive_overruns == self.slow_after:
+            _LOGGER.warning(f"Update callback {self._name(cb)} exceeded its budget of {budget}s "
+                            f"{stats.consecutive_overruns} times in a row (last call took {elapsed:.3f}s).")
+
+    def _stats(self, cb):
+        if cb not in self.stats:
+            self.stats[cb] = SaveConnectCallbackStats()
+        return self.stats[cb]
+
+    @staticmethod
+    def _name(cb):
+        return getattr(cb, "__qualname__", repr(cb))
@@ -0,0 +1,102 @@
+"""
+JSON codecs for HTTP and WebSocket payloads.
+
+orjson (pip install python-systemair-saveconnect[orjson]) or msgspec (python-systemair-saveconnect[msgspec]) are used
+when installed, the standard library json module otherwise. Every codec decodes bytes or str, encodes to bytes and
+raises json.JSONDecodeError on invalid input, so callers do not depend on the codec in use. Codecs can be pickled,
+so they can be used in a process pool.
+"""
+import json
+import logging
+import typing
+from json import JSONDecodeError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StdlibCodec:
+    name = "json"
+
+    def loads(self, data: typing.Union[bytes, str]):
+        return json.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def dumps_str(self, obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
+class OrjsonCodec(StdlibCodec):
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install python-systemair-saveconnect[orjson].")
+
+    def loads(self, data: typing.Union[bytes, str]):
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps_str(self, obj) -> str:
+        return orjson.dumps(obj).decode()
+
+
+class MsgspecCodec(StdlibCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("MsgspecCodec requires msgspec. Install python-systemair-saveconnect[msgspec].")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def __reduce__(self):
+        # msgspec encoders and decoders cannot be pickled, e.g. to a process pool
+        return self.__class__, ()
+
+    def loads(self, data: typing.Union[bytes, str]):
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj)
+
+    def dumps_str(self, obj) -> str:
+        return self._encoder.encode(obj).decode()
+
+
+CODECS = {
+    StdlibCodec.name: StdlibCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+
+
+def get_codec(name=None) -> StdlibCodec:
+    """
+    @param name: one of CODECS. The fastest installed codec if None
+    @return: the codec
+    """
+    if name is not None:
+        return CODECS[name]()
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return StdlibCodec()
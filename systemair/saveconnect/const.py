@@ -33,7 +33,15 @@ class UserModes:
     HOLIDAY = "holiday"
 
 
+class UpdateSource:
+    POLL = "poll"
+    WS = "ws"
+    WRITE = "write"
+    DERIVED = "derived"
+
+
 class APIRoutes:
+    HOME = "/device/home"
     VIEWS_UNIT_INFORMATION_COMPONENTS_DESC = "/device/unit_information/components"
     VIEWS_UNIT_INFORMATION_SENSORS_DESC = "/device/unit_information/sensors"
     VIEWS_UNIT_INFORMATION_UNIT_INPUT_STATUS_DESC = "/device/unit_information/input_status"
@@ -1,38 +1,95 @@
+import collections
 import logging
+import time
 import typing
 
-from systemair.saveconnect.models import (SaveConnectDevice,
-                                          SaveConnectRegisterItem, update)
+from systemair.saveconnect.callbacks import SaveConnectCallbackDispatcher
+from systemair.saveconnect.const import UpdateSource
+from systemair.saveconnect.metadata import SaveConnectMetadataCache
+from systemair.saveconnect.models import SaveConnectDevice, update
 from systemair.saveconnect.register import Register, SaveConnectRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class RegisterChange(typing.NamedTuple):
+    """A register value applied by an update"""
+    name: str
+    register: int
+    old: typing.Any
+    new: typing.Any
+
+    @property
+    def changed(self):
+        return self.old != self.new
+
+
 class SaveConnectData:
 
-    def __init__(self):
+    def __init__(self, dispatcher: SaveConnectCallbackDispatcher = None, metadata: SaveConnectMetadataCache = None):
         self.devices: typing.Dict[str, SaveConnectDevice] = dict()
+        self.dispatcher = dispatcher if dispatcher else SaveConnectCallbackDispatcher()
+
+        """Register metadata shared between the registries of all devices"""
+        self.metadata = metadata if metadata else SaveConnectMetadataCache()
+
+        """Consumers of applied updates, see add_sink()"""
+        self.sinks = []
+
+        """Updates applied by sinks while an update is delivered, e.g. derived metrics. They are delivered once every
+        sink has seen the update that caused them."""
+        self._deferred = collections.deque()
+        self._notifying = False
+
+    def add_sink(self, sink):
+        """
+        Add a consumer that is called as sink.on_update(device_id, changes, timestamp, source) after every applied
+        update, where changes is a list of RegisterChange and source one of UpdateSource
+        @param sink: e.g. SaveConnectHistory
+        """
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
 
     def update_device(self, device_data):
         if device_data["identifier"] not in self.devices:
             self.devices[device_data["identifier"]] = SaveConnectDevice.parse_obj(
                 {
                     **device_data,
-                    "registry": SaveConnectRegistry()
+                    "registry": SaveConnectRegistry(cache=self.metadata)
                 }
             )
         else:
             update(self.devices[device_data["identifier"]], device_data)
 
-    def update(self, device_id, data):
-
-        if device_id not in self.devices:
-            self.devices[device_id] = SaveConnectDevice.parse_obj({
-                "registry": SaveConnectRegistry()
-            })
+    def update(self, device_id, data, source=UpdateSource.POLL):
+        """
+        Apply dataItems to the registry of a device
+        @param device_id:
+        @param data: a GetDeviceView or WriteDeviceValues response, or a list of dataItems
+        @param source: where the data came from, one of UpdateSource
+        @return: success
+        """
+        self._device(device_id)
+
+        prepared = self.prepare(device_id, data)
+        if prepared is None:
+            return False
 
+        return self.apply(device_id, prepared, source)
+
+    def prepare(self, device_id, data) -> typing.Optional[typing.Tuple[dict, dict]]:
+        """
+        Extract the known registers of a response and intern the metadata of registers the device has not reported
+        yet. Nothing observable is modified, so this can run in an executor thread while the loop keeps running.
+        @param device_id:
+        @param data: a GetDeviceView or WriteDeviceValues response, or a list of dataItems
+        @return: (mapping of register name to dataItem, mapping of register name to the metadata of new registers) for
+        apply(), None if the response has no dataItems
+        """
         if data is None:
-            return False
+            return None
         elif "WriteDeviceValues" in data:
             data = data["WriteDeviceValues"]
             if data is None:
@@ -42,28 +99,126 @@ class SaveConnectData:
 
             if data is None or "dataItems" not in data:
                 _LOGGER.warning("Could not update due to missing dataItems in the API response.")
-                return False
+                return None
             data = data["dataItems"]
 
         _LOGGER.debug(f"Found {len(data)} registers for device '{device_id}'... Ignoring unknown registers.")
 
-        parsed_data = {
-            Register.map[str(x["register"])]: SaveConnectRegisterItem.parse_obj(x)
+        raw_data = {
+            Register.map[str(x["register"])]: x
             for x in data if str(x["register"]) in Register.map
         }
 
-        for cb in self.devices[device_id].cb:
-            for parse_item in parsed_data.values():
-                cb(parse_item.register_, parse_item.value, parse_item)
+        # Parsing metadata is the expensive part of the first update of a device.
+        metas = dict()
+        device = self.devices.get(device_id)
+        if device is not None and device.registry is not None:
+            registry = device.registry
+            for name, raw in raw_data.items():
+                if name not in registry:
+                    metas[name] = registry.cache.intern(raw)
+
+        return raw_data, metas
+
+    def apply(self, device_id, prepared, source=UpdateSource.POLL):
+        """
+        Apply prepared dataItems to the registry of a device and notify callbacks and sinks
+        @param device_id:
+        @param prepared: as returned by prepare()
+        @param source: one of UpdateSource
+        @return: success
+        """
+        raw_data, metas = prepared
+        _LOGGER.debug(f"Updating {len(raw_data)} registers for device '{device_id}'...")
+
+        # Update existing registry. Metadata is only parsed for registers that have not been seen before.
+        timestamp = time.time()
+        device = self._device(device_id)
+        applied = device.registry.ingest(raw_data, timestamp, metas)
+        self.notify(device_id, applied, timestamp, source)
 
-        _LOGGER.debug(f"Updating {len(parsed_data)} registers for device '{device_id}'...")
+        return True
 
-        # Update existing registry
+    def _device(self, device_id) -> SaveConnectDevice:
+        if device_id not in self.devices:
+            self.devices[device_id] = SaveConnectDevice.parse_obj({
+                "registry": SaveConnectRegistry(cache=self.metadata)
+            })
+        return self.devices[device_id]
 
-        update(self.devices[device_id].registry, parsed_data)
+    def update_values(self, device_id, values, source=UpdateSource.POLL) -> typing.Optional[bool]:
+        """
+        Apply register values of a typed decoded view, see SaveConnectViewDecoder.decode_values()
+        @param device_id:
+        @param values: list of (name, value)
+        @param source: one of UpdateSource
+        @return: success, None if the registry needs the full dataItems because of new registers or metadata
+        """
+        if device_id not in self.devices:
+            return None
 
+        timestamp = time.time()
+        applied = self.devices[device_id].registry.ingest_values(values, timestamp)
+        if applied is None:
+            return None
+        self.notify(device_id, applied, timestamp, source)
         return True
 
+    def touch(self, device_id, names, source=UpdateSource.POLL):
+        """
+        Refresh the updated_at of registers that were received again with unchanged values. The sinks are told about
+        the update with an empty list of changes, the device callbacks are not called.
+        @param device_id:
+        @param names: register names
+        @param source: one of UpdateSource
+        @return: success
+        """
+        if device_id not in self.devices:
+            return False
+
+        timestamp = time.time()
+        self.devices[device_id].registry.touch(names, timestamp)
+        for sink in self.sinks:
+            sink.on_update(device_id, [], timestamp, source)
+        return True
+
+    def notify(self, device_id, applied, timestamp, source):
+        """
+        Deliver applied register values to the device callbacks and the sinks
+        @param device_id:
+        @param applied: list of (name, slot, old value) as returned by SaveConnectRegistry.ingest
+        @param timestamp: time the values were received
+        @param source: one of UpdateSource
+        """
+        if self._notifying:
+            self._deferred.append((device_id, applied, timestamp, source))
+            return
+
+        self._notifying = True
+        try:
+            self._deliver(device_id, applied, timestamp, source)
+            while self._deferred:
+                self._deliver(*self._deferred.popleft())
+        finally:
+            self._notifying = False
+            self._deferred.clear()
+
+    def _deliver(self, device_id, applied, timestamp, source):
+        device = self.devices[device_id]
+        if device.cb:
+            self.dispatcher.dispatch(
+                device.cb,
+                [(slot.meta.register_, slot.value, slot) for _, slot, _ in applied],
+                budgets=device.cb_budgets
+            )
+
+        if self.sinks:
+            changes = [
+                RegisterChange(name, slot.meta.register_, old_value, slot.value) for name, slot, old_value in applied
+            ]
+            for sink in self.sinks:
+                sink.on_update(device_id, changes, timestamp, source)
+
     def get(self, device_id, key, value=None):
         device_data = self.devices[device_id]
         attrib = Register.map[str(key)]
@@ -75,6 +230,13 @@ class SaveConnectData:
 
         return register_data
 
+    def refresh_metadata(self, device_id):
+        """
+        Re-read the register metadata of a device on its next update, e.g. after a firmware upgrade
+        @param device_id:
+        """
+        self.devices[device_id].registry.refresh_metadata()
+
     def set_availability(self, device_id, available):
         if device_id not in self.devices:
             return
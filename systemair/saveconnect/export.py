@@ -0,0 +1,148 @@
+"""
+Columnar export of register values to Arrow and Parquet.
+
+Requires the optional pyarrow dependency (pip install python-systemair-saveconnect[arrow]). Rows are keyed by
+device, register address and timestamp and are produced as record batches of at most chunk_size rows, so memory
+stays bounded regardless of fleet size or history length.
+"""
+import logging
+import typing
+from array import array
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from .data import SaveConnectData
+from .history import SaveConnectHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SaveConnectExporter:
+
+    def __init__(self, chunk_size=65536):
+        """
+        Exporter of register values as Arrow record batches
+        @param chunk_size: maximum number of rows per record batch
+        """
+        if pa is None:
+            raise ImportError("SaveConnectExporter requires pyarrow. Install python-systemair-saveconnect[arrow].")
+
+        self.chunk_size = chunk_size
+        self.schema = pa.schema([
+            pa.field("device_id", pa.string(), nullable=False),
+            pa.field("register", pa.int32(), nullable=False),
+            pa.field("timestamp", pa.timestamp("us", tz="UTC"), nullable=False),
+            pa.field("value", pa.float64()),
+        ])
+
+    def history_batches(self, history: SaveConnectHistory, start=None, end=None,
+                        devices=None) -> typing.Iterator["pa.RecordBatch"]:
+        """
+        Record batches of the recorded history
+        @param history: the history store
+        @param start: include samples with timestamp >= start
+        @param end: include samples with timestamp < end
+        @param devices: optional collection of device ids to export
+        """
+        pieces = []
+        rows = 0
+        for device_id, register in history.series():
+            if devices is not None and device_id not in devices:
+                continue
+
+            for ts, values in history.range(device_id, register, start, end).segments:
+                while len(ts):
+                    take = min(len(ts), self.chunk_size - rows)
+                    pieces.append((device_id, register, ts[:take], values[:take]))
+                    rows += take
+                    ts, values = ts[take:], values[take:]
+
+                    if rows == self.chunk_size:
+                        yield self._batch(pieces)
+                        pieces, rows = [], 0
+
+        if pieces:
+            yield self._batch(pieces)
+
+    def current_batches(self, data: SaveConnectData, devices=None) -> typing.Iterator["pa.RecordBatch"]:
+        """
+        Record batches of the current register values of all devices, stamped with the time each value was received.
+        Registers without a numeric value are skipped.
+        @param data: the SaveConnectData holding the devices
+        @param devices: optional collection of device ids to export
+        """
+        pieces = []
+        rows = 0
+        for device_id, device in list(data.devices.items()):
+            if device.registry is None or (devices is not None and device_id not in devices):
+                continue
+
+            registers = array("i")
+            timestamps = array("d")
+            values = array("d")
+            for _, slot in device.registry.items():
+                try:
+                    values.append(float(slot.value))
+                except (TypeError, ValueError):
+                    continue
+                registers.append(slot.meta.register_)
+                timestamps.append(slot.updated_at)
+
+            offset = 0
+            while offset < len(values):
+                take = min(len(values) - offset, self.chunk_size - rows)
+                pieces.append((device_id, registers[offset:offset + take], memoryview(timestamps)[offset:offset + take],
+                               memoryview(values)[offset:offset + take]))
+                rows += take
+                offset += take
+
+                if rows == self.chunk_size:
+                    yield self._batch(pieces)
+                    pieces, rows = [], 0
+
+        if pieces:
+            yield self._batch(pieces)
+
+    def to_table(self, batches) -> "pa.Table":
+        return pa.Table.from_batches(list(batches), schema=self.schema)
+
+    def write_parquet(self, batches, path, compression="zstd") -> int:
+        """
+        Stream record batches into a Parquet file
+        @param batches: iterator of record batches, e.g. from history_batches()
+        @param path: destination file
+        @param compression: Parquet compression codec
+        @return: number of rows written
+        """
+        rows = 0
+        with pq.ParquetWriter(path, self.schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        _LOGGER.debug(f"Wrote {rows} rows to {path}")
+        return rows
+
+    def _batch(self, pieces) -> "pa.RecordBatch":
+        """
+        Build a record batch from (device_id, register(s), timestamps, values) pieces. The timestamps and values are
+        copied once into contiguous buffers, so the batch does not reference the history buffers.
+        """
+        n = sum(len(ts) for _, _, ts, _ in pieces)
+
+        device_ids = pa.concat_arrays([pa.repeat(pa.scalar(d, pa.string()), len(ts)) for d, _, ts, _ in pieces])
+        registers = pa.concat_arrays([
+            pa.repeat(pa.scalar(r, pa.int32()), len(ts)) if isinstance(r, int) else pa.array(r, pa.int32())
+            for _, r, ts, _ in pieces
+        ])
+
+        seconds = pa.Array.from_buffers(pa.float64(), n, [None, pa.py_buffer(b"".join(ts for _, _, ts, _ in pieces))])
+        timestamps = pc.multiply(seconds, 1_000_000).cast(pa.int64(), safe=False)
+        timestamps = timestamps.cast(self.schema.field("timestamp").type)
+        values = pa.Array.from_buffers(pa.float64(), n, [None, pa.py_buffer(b"".join(v for _, _, _, v in pieces))])
+
+        return pa.RecordBatch.from_arrays([device_ids, registers, timestamps, values], schema=self.schema)
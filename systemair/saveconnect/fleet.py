@@ -0,0 +1,196 @@
+"""
+Columnar index over the current register values of all devices.
+
+Requires the optional numpy dependency (pip install python-systemair-saveconnect[fleet]). Every register gets one
+float64 column with a row per device, missing or non-numeric values are NaN. The index is a SaveConnectData sink, so
+it is kept up to date by every applied update, and fleet-wide questions are answered with vectorized operations.
+
+Next to the raw values the index keeps the scale factor of every cell, taken from the interned register metadata,
+so engineering values of whole columns are a single multiplication.
+"""
+import logging
+import operator
+import typing
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class SaveConnectFleetIndex:
+
+    def __init__(self, capacity=64):
+        """
+        Fleet index. Use attach() to fill it from a SaveConnectData and keep it up to date.
+        @param capacity: initial number of device rows, grows as devices are added
+        """
+        if np is None:
+            raise ImportError("SaveConnectFleetIndex requires numpy. Install python-systemair-saveconnect[fleet].")
+
+        self.capacity = capacity
+        self.device_ids: typing.List[str] = []
+        self._rows: typing.Dict[str, int] = dict()
+        self._columns: typing.Dict[int, "np.ndarray"] = dict()
+        self._scales: typing.Dict[int, "np.ndarray"] = dict()
+        self._data = None
+
+    def attach(self, data):
+        """
+        Index the current values of all devices and add the index as a sink of data
+        @param data: the SaveConnectData
+        """
+        self._data = data
+        for device_id, device in list(data.devices.items()):
+            if device.registry is None:
+                continue
+            row = self._row(device_id)
+            for _, slot in device.registry.items():
+                self._column(slot.register_)[row] = self._float(slot.value)
+                self._scales[slot.register_][row] = slot.meta.scale
+        data.add_sink(self)
+
+    def on_update(self, device_id, changes, timestamp, source):
+        row = self._row(device_id)
+        columns = self._columns
+        for change in changes:
+            column = columns.get(change.register)
+            if column is None:
+                column = self._column(change.register)
+            column[row] = self._float(change.new)
+            if change.old is None:
+                self._scales[change.register][row] = self._scale(device_id, change.name)
+
+    def column(self, register) -> "np.ndarray":
+        """
+        @param register: register address
+        @return: the values of the register, one row per device in the order of device_ids
+        """
+        column = self._columns.get(int(register))
+        if column is None:
+            return np.full(len(self.device_ids), np.nan)
+        return column[:len(self.device_ids)]
+
+    def engineering(self, register) -> "np.ndarray":
+        """
+        @param register: register address
+        @return: the values of the register scaled by the register decimals of each device
+        """
+        register = int(register)
+        if register not in self._columns:
+            return self.column(register)
+        n = len(self.device_ids)
+        return self._columns[register][:n] * self._scales[register][:n]
+
+    def matrix(self, registers, engineering=True) -> "np.ndarray":
+        """
+        Values of many registers at once
+        @param registers: register addresses
+        @param engineering: scale the values by the register decimals
+        @return: array of shape (devices, registers)
+        """
+        if not registers:
+            return np.empty((len(self.device_ids), 0))
+        read = self.engineering if engineering else self.column
+        return np.column_stack([read(register) for register in registers])
+
+    def filter(self, register, op, value) -> "np.ndarray":
+        """
+        Devices whose register value matches a predicate. Masks can be combined with & and |.
+        @param register: register address
+        @param op: one of <, <=, >, >=, ==, !=
+        @param value: the value to compare to
+        @return: boolean mask over the device rows
+        """
+        with np.errstate(invalid="ignore"):
+            mask = _OPERATORS[op](self.column(register), value)
+        if op == "!=":
+            # NaN compares unequal to everything, but a missing value should not match.
+            mask &= ~np.isnan(self.column(register))
+        return mask
+
+    def select(self, mask) -> typing.List[str]:
+        """
+        @param mask: boolean mask from filter()
+        @return: the device ids of the selected rows
+        """
+        return [self.device_ids[i] for i in np.flatnonzero(mask)]
+
+    def mean(self, register, mask=None) -> float:
+        return self._aggregate(np.nanmean, register, mask)
+
+    def min(self, register, mask=None) -> float:
+        return self._aggregate(np.nanmin, register, mask)
+
+    def max(self, register, mask=None) -> float:
+        return self._aggregate(np.nanmax, register, mask)
+
+    def percentile(self, register, q, mask=None):
+        """
+        @param register: register address
+        @param q: percentile or sequence of percentiles in [0, 100]
+        @param mask: optional boolean mask restricting the devices
+        """
+        return self._aggregate(lambda values: np.nanpercentile(values, q), register, mask)
+
+    def count(self, register, mask=None) -> int:
+        """
+        @return: number of devices with a value for the register
+        """
+        values = self.column(register)
+        return int(np.count_nonzero(~np.isnan(values if mask is None else values[mask])))
+
+    def _aggregate(self, fn, register, mask):
+        values = self.column(register)
+        if mask is not None:
+            values = values[mask]
+        if not np.count_nonzero(~np.isnan(values)):
+            return np.nan
+        return fn(values)
+
+    def _row(self, device_id) -> int:
+        row = self._rows.get(device_id)
+        if row is not None:
+            return row
+
+        row = self._rows[device_id] = len(self.device_ids)
+        self.device_ids.append(device_id)
+        if row >= self.capacity:
+            self.capacity *= 2
+            for columns, fill in ((self._columns, np.nan), (self._scales, 1.0)):
+                for register, column in columns.items():
+                    grown = np.full(self.capacity, fill)
+                    grown[:len(column)] = column
+                    columns[register] = grown
+        return row
+
+    def _column(self, register) -> "np.ndarray":
+        column = self._columns.get(register)
+        if column is None:
+            column = self._columns[register] = np.full(self.capacity, np.nan)
+            self._scales[register] = np.ones(self.capacity)
+        return column
+
+    def _scale(self, device_id, name):
+        if self._data is None or device_id not in self._data.devices:
+            return 1.0
+        slot = getattr(self._data.devices[device_id].registry, name, None)
+        return slot.meta.scale if slot is not None else 1.0
+
+    @staticmethod
+    def _float(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
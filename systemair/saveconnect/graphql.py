@@ -1,4 +1,6 @@
-import json
+import asyncio
+import concurrent.futures
+import hashlib
 import logging
 import typing
 from json import JSONDecodeError
@@ -8,10 +10,88 @@ import httpx
 from systemair.saveconnect.models import SaveConnectDevice
 from systemair.saveconnect.registry import RegisterWrite
 
-from .const import APIRoutes
+from .const import APIRoutes, UpdateSource
+from .queries import (WRITE_DEVICE_VALUES, AccountSelection, ViewSelection, account_query, device_view_query,
+                      query_hash)
+from .notifications import Notification
+from .typed import get_view_decoder
 
 _LOGGER = logging.getLogger(__name__)
 
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+
+def decode_data(codec, content, select=None):
+    """
+    Decode the data of a response. A module level function, so it can be called in a process pool.
+    @param codec: the JSON codec
+    @param select: optional function reducing the data to the parts that are used
+    """
+    data = codec.loads(content)["data"]
+    return select(data) if select is not None else data
+
+
+class SaveConnectGraphQLStats:
+
+    def __init__(self):
+        """Polls whose response bytes were identical to the previous response of the same device and route"""
+        self.unchanged_hits = 0
+        self.unchanged_misses = 0
+        self.routes: typing.Dict[str, typing.List[int]] = dict()
+
+        """Responses decoded in the executor"""
+        self.offloaded = 0
+
+        """operation -> [requests, request bytes, response bytes on the wire, decoded response bytes, compressed
+        responses]"""
+        self.traffic: typing.Dict[str, typing.List[int]] = dict()
+
+        """Requests sent as a persisted query hash that the server knew, and that needed the full document"""
+        self.persisted_hits = 0
+        self.persisted_misses = 0
+
+    def transferred(self, operation, sent, received, decoded, compressed):
+        counters = self.traffic.setdefault(operation, [0, 0, 0, 0, 0])
+        counters[0] += 1
+        counters[1] += sent
+        counters[2] += received
+        counters[3] += decoded
+        counters[4] += compressed
+
+    def unchanged(self, route, hit):
+        counters = self.routes.setdefault(route, [0, 0])
+        if hit:
+            self.unchanged_hits += 1
+            counters[0] += 1
+        else:
+            self.unchanged_misses += 1
+            counters[1] += 1
+
+    @property
+    def unchanged_ratio(self):
+        total = self.unchanged_hits + self.unchanged_misses
+        return self.unchanged_hits / total if total else 0.0
+
+    def dict(self):
+        return dict(
+            unchanged_hits=self.unchanged_hits,
+            unchanged_misses=self.unchanged_misses,
+            unchanged_ratio=self.unchanged_ratio,
+            offloaded=self.offloaded,
+            persisted_hits=self.persisted_hits,
+            persisted_misses=self.persisted_misses,
+            routes={
+                route: dict(hits=hits, misses=misses, ratio=hits / (hits + misses))
+                for route, (hits, misses) in self.routes.items()
+            },
+            traffic={
+                operation: dict(requests=requests, sent=sent, received=received, decoded=decoded,
+                                compressed=compressed)
+                for operation, (requests, sent, received, decoded, compressed) in self.traffic.items()
+            }
+        )
+
 
 class SaveConnectGraphQL:
 
@@ -21,10 +101,52 @@ class SaveConnectGraphQL:
         self._http: httpx.AsyncClient = httpx.AsyncClient(timeout=300, transport=transport)
         self.headers = {
             "content-type": "application/json",
+            "accept-encoding": "gzip, deflate",
             "x-access-token": None
         }
         self.api_url = "https://homesolutions.systemair.com/gateway/api"
 
+        """Selection sets of the polled queries, see queries.py. The full selections fetch the view layout and the
+        account profile, which the library does not use. AccountSelection.DEVICES does not sync notifications."""
+        self.view_selection = ViewSelection.DATA
+        self.account_selection = AccountSelection.ROUTINE
+
+        """Responses of at least offload_threshold bytes are decoded and prepared in the executor (None: the loop's
+        default executor), only applying them to the registry runs on the loop. None disables offloading. Decoding
+        holds the GIL, so a ProcessPoolExecutor isolates the loop best; preparing needs the registry and then runs in
+        the loop's default executor."""
+        self.executor = None
+        self.offload_threshold = 65536
+
+        """Send queries as automatic persisted queries: the sha256 hash of the document first, the full document only
+        if the server does not know the hash yet. Turned off when the server does not support them."""
+        self.persisted_queries = False
+
+        """Skip decoding GetDeviceView responses that are byte for byte identical to the previous one"""
+        self.skip_unchanged = True
+        self.stats = SaveConnectGraphQLStats()
+
+        """Decoder of the register values of GetDeviceView responses, None to always decode the full dataItems"""
+        self.view_decoder = get_view_decoder()
+
+        """(device_id, route) -> (digest of the last applied response, names of the registers in it)"""
+        self._views: typing.Dict[typing.Tuple[str, str], typing.Tuple[bytes, typing.List[str]]] = dict()
+
+    def on_update(self, device_id, changes, timestamp, source):
+        """
+        SaveConnectData sink. A value written or pushed over the WebSocket makes the registry differ from the last
+        polled response, so an identical response must be applied again. Derived values are not part of any response.
+        """
+        if source in (UpdateSource.WS, UpdateSource.WRITE):
+            self.invalidate(device_id)
+
+    def invalidate(self, device_id):
+        """
+        Forget the last applied responses of a device, so its next poll is decoded even if unchanged
+        """
+        for key in [key for key in self._views if key[0] == device_id]:
+            del self._views[key]
+
     def set_access_token(self, _oidc_token):
         self.headers["x-access-token"] = _oidc_token["access_token"]
 
@@ -36,17 +158,13 @@ class SaveConnectGraphQL:
         @param is_import:
         @return:
         """
-        query = """
-                mutation ($input: WriteDeviceValuesInputType!) {
-                  WriteDeviceValues(input: $input)
-                }
-            """
+        query = WRITE_DEVICE_VALUES
 
         data = dict(
             input={
                 "deviceId": device_id,
                 "import": is_import,
-                "registerValues": json.dumps([
+                "registerValues": self.api.codec.dumps_str([
                     register_pair.dict()
                 ])
             }
@@ -55,24 +173,15 @@ class SaveConnectGraphQL:
         response_data = await self.post_request(
             url=self.api_url,
             data=dict(query=query, variables=data),
-            headers=self.headers
+            headers=self.headers,
+            operation="WriteDeviceValues"
         )
 
-        return self.api.data.update(device_id, response_data)
+        return self.api.data.update(device_id, response_data, source=UpdateSource.WRITE)
 
     async def queryDeviceView(self, device_id, route):
 
-        query = """
-            mutation ($input: GetDeviceViewInput!) {
-              GetDeviceView(input: $input) {
-                route
-                elements
-                dataItems
-                title
-                translationVariables
-              }
-            }
-        """
+        query = device_view_query(self.view_selection)
         data = dict(
             input=dict(
                 deviceId=device_id,
@@ -80,83 +189,93 @@ class SaveConnectGraphQL:
             )
         )
 
-        response_data = await self.post_request(
-            url=self.api_url,
-            data=dict(query=query, variables=data),
-            headers=self.headers
-        )
+        request = dict(query=query, variables=data)
+        response = await self.post(url=self.api_url, data=request, headers=self.headers, operation="GetDeviceView")
+        if response is None:
+            return False
 
-        return self.api.data.update(device_id, response_data)
+        key = (device_id, route)
+        digest = None
+        if self.skip_unchanged:
+            digest = hashlib.blake2b(response.content, digest_size=16).digest()
+            previous = self._views.get(key)
+            if previous is not None and previous[0] == digest:
+                self.stats.unchanged(route, hit=True)
+                return self.api.data.touch(device_id, previous[1], source=UpdateSource.POLL)
+            self.stats.unchanged(route, hit=False)
+
+        # Registers whose metadata is known only need their values, which the typed decoder reads in one pass.
+        size = len(response.content)
+        decoded = None
+        if self.view_decoder is not None:
+            decoded = await self._run(size, self.view_decoder.decode_values, response.content)
+        if decoded is not None:
+            registers, values = decoded
+            if self.api.data.update_values(device_id, values, source=UpdateSource.POLL):
+                self.api.planner.record(route, registers, device_id)
+                if digest is not None:
+                    self._views[key] = (digest, [name for name, _ in values])
+                return True
+
+        try:
+            response_data = await self._run(size, decode_data, self.api.codec, response.content)
+        except JSONDecodeError:
+            # Not a view, e.g. an expired token. post_request refreshes it and decodes the response of a retry, so
+            # the digest of this response must not be stored.
+            digest = None
+            response_data = await self.post_request(
+                url=self.api_url, data=request, headers=self.headers, response=response
+            )
+
+        view = response_data.get("GetDeviceView") if response_data else None
+        if view and view.get("dataItems") is not None:
+            self.api.planner.record(route, (x["register"] for x in view["dataItems"]), device_id)
+
+        prepared = await self._run(size, self.api.data.prepare, device_id, response_data, shared=True)
+        success = prepared is not None and self.api.data.apply(device_id, prepared, source=UpdateSource.POLL)
+        if success and digest is not None:
+            self._views[key] = (digest, list(prepared[0]))
+        return success
+
+    async def _run(self, size, fn, *args, shared=False):
+        """
+        Call fn in the executor if it works on a payload of at least offload_threshold bytes, inline otherwise
+        @param size: payload size in bytes
+        @param shared: fn works on the state of this process, so it runs in the loop's default executor if the
+        executor is a process pool
+        """
+        if self.offload_threshold is None or size < self.offload_threshold:
+            return fn(*args)
+        executor = self.executor
+        if shared and isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            executor = None
+        self.stats.offloaded += 1
+        return await asyncio.get_event_loop().run_in_executor(executor, fn, *args)
 
     async def queryGetDeviceData(self, device_id, change_mode=False):
         success = await self.queryDeviceView(
             device_id=device_id,
-            route=f"/device/home{'' if not change_mode else '/changeMode'}"
+            route=f"{APIRoutes.HOME}{'' if not change_mode else '/changeMode'}"
         )
         return success
 
-    async def queryGetAccount(self) -> typing.List['SaveConnectDevice']:
-        query = """
-            {
-              GetAccount {
-                email
-                firstName
-                lastName
-                city
-                country
-                locale
-                phoneNumber
-                street
-                role
-                zipCode
-                permissions
-                exists
-                disabled
-                devices {
-                  name
-                  identifier
-                  connectionStatus
-                  startupWizardRequired
-                  updateInProgress
-                  units {
-                    temperature
-                    pressure
-                    flow
-                  }
-                  street
-                  zipcode
-                  city
-                  country
-                  serviceLocked
-                  filterLocked
-                  weekScheduleLocked
-                  hasAlarms
-                }
-                notifications {
-                  id
-                  title
-                  description
-                  type
-                  unread
-                  email
-                  properties
-                  createdAt
-                }
-                company {
-                  companyName
-                  referenceEmail
-                  referenceName
-                  responsiblePerson
-                  responsiblePersonPhoneNumber
-                }
-              }
-            }
+    async def queryActiveAlarms(self, device: SaveConnectDevice):
+        """
+        Read the alarm registers of a device
+        @param device:
+        @return: success
         """
+        return await self.queryDeviceView(device.identifier, APIRoutes.ACTIVE_ALARMS)
+
+    async def queryGetAccount(self) -> typing.List['SaveConnectDevice']:
+        query = account_query(self.account_selection)
 
         response_data = await self.post_request(
             url=self.api_url,
             data=dict(query=query, variables={}),
-            headers=self.headers
+            headers=self.headers,
+            select=self._account_data,
+            operation="GetAccount"
         )
 
         if response_data is None:
@@ -166,8 +285,42 @@ class SaveConnectGraphQL:
         for device_data in response_data["GetAccount"]["devices"]:
             self.api.data.update_device(device_data=device_data)
 
+        # Full notifications are only fetched when the summaries contain ids that were not seen before
+        notifications = response_data["GetAccount"].get("notifications")
+        if notifications is not None and self.api.notifications.sync(notifications):
+            self.api.notifications.merge(await self._fetch_notifications())
+
         return list(self.api.data.devices.values())
 
+    @staticmethod
+    def _account_data(data):
+        if not data or not data.get("GetAccount"):
+            return data
+        account = data["GetAccount"]
+        return {"GetAccount": {key: account[key] for key in ("devices", "notifications") if key in account}}
+
+    async def queryNotifications(self) -> typing.List[Notification]:
+        """
+        Fetch the full notifications of the account and merge them into the notification store
+        @return: every notification of the account, newest first
+        """
+        raw_items = await self._fetch_notifications()
+        self.api.notifications.merge(raw_items)
+        notifications = [Notification.from_raw(raw) for raw in raw_items]
+        notifications.sort(key=lambda item: item.created_at or 0.0, reverse=True)
+        return notifications
+
+    async def _fetch_notifications(self) -> typing.List[dict]:
+        response_data = await self.post_request(
+            url=self.api_url,
+            data=dict(query=account_query(AccountSelection.NOTIFICATIONS), variables={}),
+            headers=self.headers,
+            operation="GetNotifications"
+        )
+        if not response_data or not response_data.get("GetAccount"):
+            return []
+        return response_data["GetAccount"].get("notifications") or []
+
     async def queryDeviceInfo(self, device: SaveConnectDevice):
         statuses = []
         for route in [
@@ -186,31 +339,116 @@ class SaveConnectGraphQL:
 
         return all(statuses)
 
-    async def post_request(self, url, data, headers, retry=False):
+    async def post(self, url, data, headers, operation="other") -> typing.Optional[httpx.Response]:
+        """
+        @param operation: name the request is counted under in stats.traffic
+        @return: the raw response, None if the API could not be reached
+        """
+        if not self.persisted_queries or "query" not in data:
+            return await self._send(url, data, headers, operation)
+
+        extensions = dict(persistedQuery=dict(version=1, sha256Hash=query_hash(data["query"])))
+        request = {key: value for key, value in data.items() if key != "query"}
+        request["extensions"] = extensions
+        response = await self._send(url, request, headers, operation)
+        if response is None:
+            return None
+
+        error = self._persisted_query_error(response)
+        rejected = error == PERSISTED_QUERY_NOT_SUPPORTED or response.status_code >= 400
+        if error is None or (not rejected and error != PERSISTED_QUERY_NOT_FOUND and self.stats.persisted_hits):
+            # Once the server answered a hash, other errors are errors of the query itself and are not sent again
+            self.stats.persisted_hits += 1
+            return response
 
+        self.stats.persisted_misses += 1
+        if error == PERSISTED_QUERY_NOT_FOUND:
+            # Registers the document under its hash for the next requests
+            return await self._send(url, dict(data, extensions=extensions), headers, operation)
+
+        response = await self._send(url, data, headers, operation)
+        # Before the first hit, an error that the full document does not reproduce means the hash alone was not
+        # understood
+        if response is not None and (rejected or self._persisted_query_error(response) is None):
+            _LOGGER.info(f"The API does not support persisted queries ({error}). Sending full queries.")
+            self.persisted_queries = False
+        return response
+
+    def _persisted_query_error(self, response: httpx.Response) -> typing.Optional[str]:
+        """
+        @return: PERSISTED_QUERY_NOT_FOUND if the server does not know the hash, PERSISTED_QUERY_NOT_SUPPORTED or the
+        error message if the request failed otherwise, None if the response answers the query
+        """
+        content = response.content
+        # Errors are small, answered queries and expired tokens are left to the regular handling
+        if len(content) > 4096 or b"UnauthorizedError" in content:
+            return None
+        try:
+            body = self.api.codec.loads(content)
+        except JSONDecodeError:
+            return PERSISTED_QUERY_NOT_SUPPORTED if response.status_code >= 400 else None
+        if not isinstance(body, dict) or body.get("data") is not None:
+            return None
+
+        errors = body.get("errors") or []
+        for error in errors:
+            code = (error.get("extensions") or {}).get("code")
+            if error.get("message") == PERSISTED_QUERY_NOT_FOUND or code == "PERSISTED_QUERY_NOT_FOUND":
+                return PERSISTED_QUERY_NOT_FOUND
+            if error.get("message") == PERSISTED_QUERY_NOT_SUPPORTED or code == "PERSISTED_QUERY_NOT_SUPPORTED":
+                return PERSISTED_QUERY_NOT_SUPPORTED
+        if errors:
+            return str(errors[0].get("message"))
+        return PERSISTED_QUERY_NOT_SUPPORTED if response.status_code >= 400 else None
+
+    async def _send(self, url, data, headers, operation) -> typing.Optional[httpx.Response]:
+        content = self.api.codec.dumps(data)
         try:
             response = await self._http.post(
                 url=url,
-                json=data,
+                content=content,
                 headers=headers
             )
+            self.stats.transferred(
+                operation,
+                sent=len(content),
+                received=response.num_bytes_downloaded,
+                decoded=len(response.content),
+                compressed=response.headers.get("content-encoding", "identity") != "identity"
+            )
+            return response
 
-        except TimeoutError as e:
-            _LOGGER.warning(f"Got timeout error when reading API. Error: {e}")
+        except (TimeoutError, httpx.TimeoutException) as e:
+            _LOGGER.warning(f"Got timeout error when reading API. Error: {e!r}")
             return None
-        except httpx.ConnectError as e:
-            _LOGGER.warning(f"Failed to connect to the API. Error: {e}")
+        except httpx.TransportError as e:
+            _LOGGER.warning(f"Failed to connect to the API. Error: {e!r}")
             return None
 
+    async def post_request(self, url, data, headers, retry=False, response: httpx.Response = None, select=None,
+                           operation="other"):
+        """
+        @param response: an already received response to decode instead of posting the request
+        @param select: optional function reducing the data to the parts that are used. It runs in the same executor
+        call as the decoding, so the rest of a large response is also released off the loop.
+        @return: the data of the response
+        """
+        if response is None:
+            response = await self.post(url, data, headers, operation=operation)
+            if response is None:
+                return None
+
         try:
-            response_data = response.json()["data"]
+            response_data = await self._run(
+                len(response.content), decode_data, self.api.codec, response.content, select
+            )
             return response_data
         except JSONDecodeError as e:
 
             if not retry and "UnauthorizedError" in response.text:
                 _LOGGER.warning("Response indicates token expiry. Refreshing token and retry")
                 await self.api.refresh_token()
-                return await self.post_request(url, data, headers, retry=True)
+                return await self.post_request(url, data, headers, retry=True, select=select, operation=operation)
 
             _LOGGER.warning(f"Could not parse JSON. Content: {response.content}")
             raise e
@@ -0,0 +1,184 @@
+"""
+Memory-bounded history of register values.
+
+Every (device, register) pair gets a bounded ring buffer holding timestamps and values in typed arrays. Buffers start
+small and double up to their capacity, so registers that rarely change do not cost a full buffer. Reading a time range
+returns memoryviews into the buffer instead of copies.
+"""
+import bisect
+import logging
+import typing
+from array import array
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SaveConnectHistoryView:
+    """
+    Read-only view of a time range of a ring buffer. A range that wraps around the end of the buffer consists of two
+    segments, each a pair of (timestamps, values) memoryviews.
+    """
+    __slots__ = ("segments",)
+
+    def __init__(self, segments):
+        self.segments: typing.List[typing.Tuple[memoryview, memoryview]] = [s for s in segments if len(s[0])]
+
+    def __len__(self):
+        return sum(len(ts) for ts, _ in self.segments)
+
+    def __iter__(self):
+        for ts, values in self.segments:
+            yield from zip(ts, values)
+
+    @property
+    def timestamps(self):
+        for ts, _ in self.segments:
+            yield from ts
+
+    @property
+    def values(self):
+        for _, values in self.segments:
+            yield from values
+
+    def to_arrays(self) -> typing.Tuple[array, array]:
+        """
+        @return: a contiguous copy of the range as (timestamps, values) arrays
+        """
+        ts, values = array("d"), array("d")
+        for segment_ts, segment_values in self.segments:
+            ts.frombytes(segment_ts.tobytes())
+            values.frombytes(segment_values.tobytes())
+        return ts, values
+
+
+class SaveConnectRingBuffer:
+    __slots__ = ("capacity", "timestamps", "values", "head", "count")
+
+    def __init__(self, capacity):
+        """
+        Bounded buffer of (timestamp, value) samples, overwriting the oldest sample when full
+        @param capacity: number of samples kept
+        """
+        self.capacity = capacity
+        self.timestamps = array("d")
+        self.values = array("d")
+        self.head = 0
+        self.count = 0
+
+    def _grow(self):
+        # Grown into new arrays, as views handed out by range() keep the old ones from being resized
+        size = min(self.capacity, max(16, 2 * len(self.timestamps)))
+        padding = bytes(8 * (size - len(self.timestamps)))
+        for name in ("timestamps", "values"):
+            grown = array("d", getattr(self, name))
+            grown.frombytes(padding)
+            setattr(self, name, grown)
+
+    def append(self, timestamp, value):
+        if self.head == len(self.timestamps):
+            self._grow()
+        self.timestamps[self.head] = timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def last(self):
+        if not self.count:
+            return None
+        i = (self.head - 1) % self.capacity
+        return self.timestamps[i], self.values[i]
+
+    def _segments(self):
+        """
+        @return: (start, end) index pairs of the stored samples in chronological order
+        """
+        if self.count < self.capacity:
+            return [(0, self.count)]
+        return [(self.head, self.capacity), (0, self.head)]
+
+    def range(self, start=None, end=None) -> SaveConnectHistoryView:
+        """
+        @param start: include samples with timestamp >= start
+        @param end: include samples with timestamp < end
+        @return: view of the samples within the range
+        """
+        ts_view = memoryview(self.timestamps)
+        values_view = memoryview(self.values)
+        segments = []
+        for lo, hi in self._segments():
+            if start is not None:
+                lo = bisect.bisect_left(ts_view, start, lo, hi)
+            if end is not None:
+                hi = bisect.bisect_left(ts_view, end, lo, hi)
+            segments.append((ts_view[lo:hi], values_view[lo:hi]))
+        return SaveConnectHistoryView(segments)
+
+    def __len__(self):
+        return self.count
+
+
+class SaveConnectHistory:
+
+    def __init__(self, capacity=1440, registers=None):
+        """
+        Register history store. Add it to SaveConnectData with add_sink() to record every applied update.
+        @param capacity: number of samples kept per device and register
+        @param registers: optional collection of register addresses to record. Records all numeric registers if None
+        """
+        self.capacity = capacity
+        self.registers = frozenset(int(r) for r in registers) if registers is not None else None
+        self._buffers: typing.Dict[typing.Tuple[str, int], SaveConnectRingBuffer] = dict()
+
+    def on_update(self, device_id, changes, timestamp, source):
+        for change in changes:
+            self.record(device_id, change.register, change.new, timestamp)
+
+    def record(self, device_id, register, value, timestamp):
+        """
+        Record a single sample. Values that are not numeric are ignored.
+        @param device_id:
+        @param register: register address
+        @param value: the register value
+        @param timestamp: unix timestamp of the sample
+        """
+        if self.registers is not None and register not in self.registers:
+            return
+
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return
+
+        key = (device_id, register)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = SaveConnectRingBuffer(self.capacity)
+        buffer.append(timestamp, value)
+
+    def range(self, device_id, register, start=None, end=None) -> SaveConnectHistoryView:
+        """
+        Samples of a register within a time range, without copying
+        @param device_id:
+        @param register: register address
+        @param start: include samples with timestamp >= start
+        @param end: include samples with timestamp < end
+        """
+        buffer = self._buffers.get((device_id, int(register)))
+        if buffer is None:
+            return SaveConnectHistoryView([])
+        return buffer.range(start, end)
+
+    def last(self, device_id, register):
+        buffer = self._buffers.get((device_id, int(register)))
+        return buffer.last() if buffer else None
+
+    def series(self) -> typing.List[typing.Tuple[str, int]]:
+        """
+        @return: all recorded (device_id, register) pairs
+        """
+        return list(self._buffers)
+
+    @property
+    def nbytes(self):
+        return sum(b.timestamps.itemsize * len(b.timestamps) * 2 for b in self._buffers.values())
@@ -0,0 +1,161 @@
+"""
+Append-only journal of applied register changes.
+
+SaveConnectJournal is a SaveConnectData sink that appends every applied change to segment files in a directory,
+one JSON record per line. SaveConnectJournalReader tails the journal from another process, so consumers on other
+nodes can follow the register stream without polling the SaveConnect API themselves.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+_SEGMENT_NAME = "journal-{:012d}.log"
+_SEGMENT_PATTERN = re.compile(r"^journal-(\d{12})\.log$")
+
+
+class JournalRecord(typing.NamedTuple):
+    device_id: str
+    register: int
+    name: str
+    old: typing.Any
+    new: typing.Any
+    timestamp: float
+    source: str
+
+
+def _segments(directory) -> typing.List[int]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(int(m.group(1)) for m in (_SEGMENT_PATTERN.match(f) for f in os.listdir(directory)) if m)
+
+
+def _segment_path(directory, sequence):
+    return os.path.join(directory, _SEGMENT_NAME.format(sequence))
+
+
+class SaveConnectJournal:
+
+    def __init__(self, directory, segment_size=64 * 1024 * 1024, max_segments=None, changes_only=True):
+        """
+        Journal writer. Add it to SaveConnectData with add_sink().
+        @param directory: directory holding the segment files
+        @param segment_size: size in bytes after which a new segment is started
+        @param max_segments: optional number of segments to keep, older segments are deleted
+        @param changes_only: only journal registers whose value changed
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.changes_only = changes_only
+
+        os.makedirs(directory, exist_ok=True)
+        segments = _segments(directory)
+        self.sequence = segments[-1] if segments else 0
+        self._file = open(_segment_path(directory, self.sequence), "ab")
+
+    def on_update(self, device_id, changes, timestamp, source):
+        lines = [
+            json.dumps([device_id, c.register, c.name, c.old, c.new, timestamp, source], separators=(",", ":"))
+            for c in changes if not self.changes_only or c.changed
+        ]
+        if lines:
+            self.append(("\n".join(lines) + "\n").encode())
+
+    def append(self, chunk: bytes):
+        """
+        Append encoded records. Records are never split across segments.
+        @param chunk: newline terminated records
+        """
+        if self._file.tell() and self._file.tell() + len(chunk) > self.segment_size:
+            self._roll()
+        self._file.write(chunk)
+        self._file.flush()
+
+    def _roll(self):
+        self._file.close()
+        self.sequence += 1
+        self._file = open(_segment_path(self.directory, self.sequence), "ab")
+        _LOGGER.debug(f"Started journal segment {self.sequence} in {self.directory}")
+
+        if self.max_segments:
+            for sequence in _segments(self.directory)[:-self.max_segments]:
+                os.remove(_segment_path(self.directory, sequence))
+
+    def close(self):
+        self._file.close()
+
+
+class SaveConnectJournalReader:
+
+    def __init__(self, directory, position: typing.Tuple[int, int] = None):
+        """
+        Tailing reader of a journal
+        @param directory: directory holding the segment files
+        @param position: (segment, offset) to continue from, e.g. a previously stored reader.position.
+                         Starts at the oldest segment if None
+        """
+        self.directory = directory
+        if position is None:
+            segments = _segments(directory)
+            position = (segments[0] if segments else 0, 0)
+        self.position = position
+
+    def read(self, limit=None) -> typing.List[JournalRecord]:
+        """
+        Read the records appended since the last call. Never blocks on new data.
+        @param limit: optional maximum number of records to return
+        @return: new records
+        """
+        records = []
+        while True:
+            sequence, offset = self.position
+            path = _segment_path(self.directory, sequence)
+
+            # A segment is complete once a later one exists, as the writer never goes back.
+            later = [s for s in _segments(self.directory) if s > sequence]
+
+            if os.path.exists(path):
+                offset = self._read_segment(path, offset, records, limit)
+                self.position = (sequence, offset)
+            elif later:
+                _LOGGER.warning(f"Journal segment {sequence} was removed before it was read.")
+
+            if not later or (limit is not None and len(records) >= limit):
+                break
+
+            if os.path.exists(path) and os.path.getsize(path) > offset:
+                _LOGGER.warning(f"Skipping incomplete record at the end of journal segment {sequence}.")
+            self.position = (later[0], 0)
+
+        return records
+
+    @staticmethod
+    def _read_segment(path, offset, records, limit):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if limit is not None and len(records) >= limit:
+                    break
+                if not line.endswith(b"\n"):
+                    # Partially written record, it is completed by a later write.
+                    break
+                offset += len(line)
+                records.append(JournalRecord(*json.loads(line)))
+        return offset
+
+    async def follow(self, interval=1.0) -> typing.AsyncIterator[JournalRecord]:
+        """
+        Yield records as they are appended
+        @param interval: seconds to wait between checks when there is no new data
+        """
+        while True:
+            records = self.read()
+            for record in records:
+                yield record
+            if not records:
+                await asyncio.sleep(interval)
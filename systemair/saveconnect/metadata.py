@@ -0,0 +1,150 @@
+"""
+Static register metadata.
+
+Every GetDeviceView response repeats options, limits, decimals etc. for each register. This metadata is parsed
+once, interned in a SaveConnectMetadataCache and shared between all devices reporting identical metadata. The
+registry of a device only stores a small value slot per register that points at the shared metadata.
+"""
+import copyreg
+import json
+import logging
+import time
+import typing
+
+from .models import SaveConnectRegisterItem
+from .register import SaveConnectRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+STATIC_FIELDS = (
+    "defaultValue",
+    "options",
+    "readOnly",
+    "type",
+    "internalDeviceType",
+    "min",
+    "max",
+    "decimals",
+    "increment",
+    "exportable",
+    "conditionalProperties",
+)
+
+
+class SaveConnectRegisterMeta:
+    """
+    Immutable metadata of a register, shared between devices.
+    scale is the precomputed factor from raw to engineering value, 10 ** -decimals.
+    """
+    __slots__ = ("register_",) + STATIC_FIELDS + ("scale",)
+
+    def __init__(self, item: SaveConnectRegisterItem):
+        object.__setattr__(self, "register_", item.register_)
+        for field in STATIC_FIELDS:
+            object.__setattr__(self, field, getattr(item, field))
+        object.__setattr__(self, "scale", 10.0 ** -(item.decimals or 0))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Register metadata is shared between devices and cannot be modified")
+
+    def __reduce__(self):
+        return copyreg.__newobj__, (type(self),), tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def dict(self):
+        data = {field: getattr(self, field) for field in ("register_",) + STATIC_FIELDS}
+        if self.options is not None:
+            data["options"] = {key: option.dict() for key, option in self.options.items()}
+        return data
+
+
+class SaveConnectRegisterValue:
+    """
+    Value slot of a register in a device registry. Metadata attributes are read from the shared metadata, so the
+    slot can be used like a SaveConnectRegisterItem (item.value, item.min, item["max"]).
+    """
+    __slots__ = ("meta", "value", "updated_at")
+
+    def __init__(self, meta: SaveConnectRegisterMeta, value, updated_at=None):
+        self.meta = meta
+        self.value = value
+        self.updated_at = updated_at if updated_at is not None else time.time()
+
+    @property
+    def engineering_value(self):
+        """The value scaled by the register decimals, None if the value is not numeric"""
+        try:
+            return float(self.value) * self.meta.scale
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def age(self):
+        """Seconds since the value was last received"""
+        return time.time() - self.updated_at
+
+    def __getattr__(self, name):
+        # Only called for missing attributes. meta is missing while copy and pickle build the slot, and dunder
+        # lookups must not reach the metadata.
+        if name == "meta" or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+        return getattr(self.meta, name)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def dict(self):
+        return {**self.meta.dict(), "value": self.value}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(register={self.meta.register_}, value={self.value!r})"
+
+
+class SaveConnectMetadataCache:
+
+    value_type = SaveConnectRegisterValue
+
+    def __init__(self):
+        """
+        Interning pool of register metadata
+        """
+        self._pool: typing.Dict[typing.Tuple[int, str], SaveConnectRegisterMeta] = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, raw: dict) -> SaveConnectRegisterMeta:
+        """
+        Retrieve the shared metadata for a raw dataItem, parsing it if it has not been seen before
+        @param raw: a dataItem from the API
+        @return: the shared metadata
+        """
+        static = json.dumps([raw.get(field) for field in STATIC_FIELDS], sort_keys=True, default=str)
+        key = (int(raw["register"]), static)
+        meta = self._pool.get(key)
+        if meta is not None:
+            self.hits += 1
+            return meta
+
+        self.misses += 1
+        meta = SaveConnectRegisterMeta(SaveConnectRegisterItem.parse_obj(raw))
+        self._pool[key] = meta
+        return meta
+
+    def slot(self, raw: dict, timestamp=None) -> SaveConnectRegisterValue:
+        return self.value_type(self.intern(raw), raw.get("value"), timestamp)
+
+    def clear(self):
+        self._pool.clear()
+
+    def __len__(self):
+        return len(self._pool)
+
+
+# Registries created without an explicit cache share this one.
+SaveConnectRegistry.default_cache = SaveConnectMetadataCache()
@@ -0,0 +1,165 @@
+"""
+Derived metrics computed from raw registers.
+
+A DerivedMetric declares the Register addresses it depends on and a function of their engineering values.
+SaveConnectDerivedMetrics is a SaveConnectData sink that recomputes only the metrics whose inputs changed in an
+update and stores the results in the device registry under the metric name and a synthetic register address, so
+they reach callbacks and sinks such as SaveConnectHistory like any other register.
+"""
+import logging
+import typing
+
+from .const import UpdateSource
+from .metadata import SaveConnectRegisterMeta
+from .models import SaveConnectRegisterItem
+from .register import Register, SaveConnectRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Synthetic register addresses of derived metrics start here"""
+DERIVED_REGISTER_BASE = 1000000
+
+"""Synthetic register addresses by metric name. Names and addresses are process-wide, like Register.map, so every
+engine shares one assignment"""
+_addresses: typing.Dict[str, int] = dict()
+
+
+def _assign_address(metric) -> int:
+    """
+    @return: the synthetic register address of a metric, a new one if the metric has none and its name is new
+    @raise ValueError: if the name or address is already used by another register or metric
+    """
+    address = metric.address if metric.address is not None else _addresses.get(metric.name)
+    if address is None:
+        address = max([DERIVED_REGISTER_BASE - 1] + list(_addresses.values())) + 1
+        while str(address) in Register.map:
+            address += 1
+
+    if _addresses.get(metric.name, address) != address:
+        raise ValueError(f"Derived metric {metric.name} already has the address {_addresses[metric.name]}")
+    owner = Register.map.get(str(address))
+    if owner is not None and owner != metric.name:
+        raise ValueError(f"Address {address} of derived metric {metric.name} is already used by {owner}")
+    if owner is None and metric.name in SaveConnectRegistry.names:
+        raise ValueError(f"Derived metric name {metric.name} is already a register name")
+
+    _addresses[metric.name] = address
+    return address
+
+
+class DerivedMetric:
+
+    def __init__(self, name, inputs: typing.List[int], fn: typing.Callable, address=None):
+        """
+        @param name: name the metric is exposed as in the registry, e.g. DERIVED_HEAT_RECOVERY_EFFICIENCY
+        @param inputs: Register addresses the metric depends on
+        @param fn: called with the engineering values of the inputs, returns the metric value or None
+        @param address: synthetic register address, assigned by SaveConnectDerivedMetrics if None. Must not be used by
+        another register or metric
+        """
+        self.name = name
+        self.inputs = [int(register) for register in inputs]
+        self.fn = fn
+        self.address = address
+        self.meta: typing.Optional[SaveConnectRegisterMeta] = None
+        self._input_names = [Register.map[str(register)] for register in self.inputs]
+
+    def compute(self, registry) -> typing.Optional[float]:
+        values = registry.values(self._input_names)
+        if any(value is None for value in values):
+            return None
+        try:
+            return self.fn(*values)
+        except ZeroDivisionError:
+            return None
+
+
+def heat_recovery_efficiency(oat, sat, eat):
+    """Temperature efficiency of the heat exchanger in percent"""
+    if eat == oat:
+        return None
+    return 100.0 * (sat - oat) / (eat - oat)
+
+
+def airflow_balance(supply, extract):
+    """Supply airflow relative to extract airflow in percent"""
+    if not extract:
+        return None
+    return 100.0 * supply / extract
+
+
+HEAT_RECOVERY_EFFICIENCY = DerivedMetric(
+    "DERIVED_HEAT_RECOVERY_EFFICIENCY",
+    [Register.REG_SENSOR_OAT, Register.REG_SENSOR_SAT, Register.REG_SENSOR_EAT],
+    heat_recovery_efficiency
+)
+
+AIRFLOW_BALANCE = DerivedMetric(
+    "DERIVED_AIRFLOW_BALANCE",
+    [Register.REG_SENSOR_FLOW_SAF, Register.REG_SENSOR_FLOW_EAF],
+    airflow_balance
+)
+
+
+class SaveConnectDerivedMetrics:
+
+    def __init__(self, data, metrics: typing.Iterable[DerivedMetric] = (HEAT_RECOVERY_EFFICIENCY, AIRFLOW_BALANCE)):
+        """
+        Derived metrics engine. Adds itself as a sink of data.
+        @param data: the SaveConnectData
+        @param metrics: the metrics to compute
+        """
+        self.data = data
+        self.metrics: typing.List[DerivedMetric] = []
+        self._dependents: typing.Dict[int, typing.List[DerivedMetric]] = dict()
+
+        for metric in metrics:
+            self.add(metric)
+        data.add_sink(self)
+
+    def add(self, metric: DerivedMetric):
+        """
+        Add a metric and expose its name and address like a register
+        @param metric:
+        @raise ValueError: if the engine already has a metric of that name, or the name or address is used by another
+        register or metric
+        """
+        if any(existing.name == metric.name for existing in self.metrics):
+            raise ValueError(f"Derived metric {metric.name} was already added")
+        metric.address = _assign_address(metric)
+        metric.meta = SaveConnectRegisterMeta(SaveConnectRegisterItem.parse_obj({
+            "register": metric.address,
+            "defaultValue": 0,
+            "value": 0,
+            "type": 0,
+            "readOnly": True
+        }))
+
+        SaveConnectRegistry.add_name(metric.name)
+        Register.map[str(metric.address)] = metric.name
+
+        self.metrics.append(metric)
+        for register in metric.inputs:
+            self._dependents.setdefault(register, []).append(metric)
+
+    def on_update(self, device_id, changes, timestamp, source):
+        if source == UpdateSource.DERIVED:
+            return
+
+        affected = dict()
+        for change in changes:
+            if change.changed:
+                for metric in self._dependents.get(change.register, ()):
+                    affected[metric.name] = metric
+        if not affected:
+            return
+
+        registry = self.data.devices[device_id].registry
+        applied = []
+        for metric in affected.values():
+            value = metric.compute(registry)
+            if value is not None:
+                applied.append(registry.assign(metric.name, metric.meta, value, timestamp))
+
+        if applied:
+            self.data.notify(device_id, applied, timestamp, UpdateSource.DERIVED)
@@ -1,4 +1,3 @@
-import sys
 from typing import Dict
 
 from pydantic import BaseModel, Field, typing
@@ -35,10 +34,6 @@ class SaveConnectRegisterItem(BaseModel):
 
 from .register import SaveConnectRegistry
 
-# hacking this together.
-sys.modules[SaveConnectRegistry.__module__].SaveConnectRegisterItem = SaveConnectRegisterItem
-SaveConnectRegistry.update_forward_refs()
-
 
 class SaveConnectDevice(BaseModel):
     name: str
@@ -57,13 +52,26 @@ class SaveConnectDevice(BaseModel):
     units: SaveConnectDeviceUnits
     registry: 'SaveConnectRegistry' = None
 
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {SaveConnectRegistry: lambda registry: registry.dict()}
+
     cb = []
+    cb_budgets = {}
 
     async def update(self, api):
         return await api.read_data(self)
 
-    def add_update_callback(self, cb):
+    def add_update_callback(self, cb, budget=None):
+        """
+        Register a callback that is called as cb(register, value, item) for every updated register.
+        Coroutine functions are scheduled on the event loop instead of being called inline.
+        @param cb: function or coroutine function
+        @param budget: optional time budget (seconds) per call, overriding the dispatcher default
+        """
         self.cb.append(cb)
+        if budget is not None:
+            self.cb_budgets[cb] = budget
 
 
 def update(self, data: Dict):
@@ -0,0 +1,178 @@
+"""
+Account notification store.
+
+Routine account refreshes only select the id and unread flag of every notification. SaveConnectNotifications
+deduplicates them by id against the notifications it has seen, and the full notifications are only requested when an
+unseen id shows up or when they are asked for. Only unread or recent notifications are kept in memory, up to
+max_items.
+"""
+import datetime
+import logging
+import time
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Notification(typing.NamedTuple):
+    id: str
+    title: typing.Optional[str]
+    description: typing.Optional[str]
+    type: typing.Optional[str]
+    unread: bool
+    email: typing.Optional[bool]
+    properties: typing.Any
+    created_at: typing.Optional[float]
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "Notification":
+        return cls(
+            id=str(raw["id"]),
+            title=raw.get("title"),
+            description=raw.get("description"),
+            type=raw.get("type"),
+            unread=bool(raw.get("unread")),
+            email=raw.get("email"),
+            properties=raw.get("properties"),
+            created_at=parse_created_at(raw.get("createdAt")),
+        )
+
+
+def parse_created_at(value) -> typing.Optional[float]:
+    """
+    @param value: ISO 8601 timestamp, e.g. 2023-01-01T00:00:00.000Z
+    @return: the unix timestamp, None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class SaveConnectNotifications:
+
+    def __init__(self, data, max_items=200, max_age=30 * 86400):
+        """
+        Notification store of the account
+        @param data: the SaveConnectData, whose dispatcher calls the callbacks
+        @param max_items: most notifications kept in memory. Unread and then the newest are kept first
+        @param max_age: read notifications older than this (seconds) are dropped
+        """
+        self.data = data
+        self.max_items = max_items
+        self.max_age = max_age
+        self.callbacks: typing.List[typing.Callable] = []
+
+        self._items: typing.Dict[str, Notification] = dict()
+
+        """Ids of every notification on the server at the last sync, stored or not"""
+        self._seen: typing.Set[str] = set()
+
+        """Ids returned by the last sync whose details have not been merged yet"""
+        self._pending: typing.Set[str] = set()
+
+        """The notifications of the first sync are existing ones, callbacks are only called after it"""
+        self._synced = False
+
+    def add_callback(self, cb):
+        """
+        Register a callback that is called as cb(notification) for every notification that was not seen before.
+        Coroutine functions are scheduled through the SaveConnectData dispatcher.
+        """
+        self.callbacks.append(cb)
+
+    def sync(self, raw_items: typing.List[dict], now=None) -> typing.List[str]:
+        """
+        Apply the notifications of an account refresh. Items with a title are merged as full notifications, the
+        others only update the unread flag of stored notifications. Notifications that are no longer on the server
+        are dropped.
+        @param raw_items: the notifications of a GetAccount response
+        @return: ids that were not seen before and whose details are missing
+        """
+        ids = set(str(raw["id"]) for raw in raw_items)
+        missing = []
+        full = []
+        for raw in raw_items:
+            notification_id = str(raw["id"])
+            if "title" in raw:
+                full.append(raw)
+            elif notification_id not in self._seen:
+                missing.append(notification_id)
+            else:
+                item = self._items.get(notification_id)
+                if item is not None and item.unread != bool(raw.get("unread")):
+                    self._items[notification_id] = item._replace(unread=bool(raw.get("unread")))
+
+        for notification_id in [x for x in self._items if x not in ids]:
+            del self._items[notification_id]
+        # Missing ids are only seen once their details are merged
+        self._seen.intersection_update(ids)
+        self._pending = set(missing)
+
+        self._notify(self._merge(full))
+        self._trim(now)
+        if not missing:
+            self._synced = True
+        return missing
+
+    def merge(self, raw_items: typing.List[dict], now=None) -> typing.List[Notification]:
+        """
+        Add full notifications that were not seen before and update the stored ones. The first sync is complete once
+        the details of all its missing ids are merged, an empty or failed fetch leaves it incomplete.
+        @param raw_items: full notifications, e.g. of the AccountSelection.NOTIFICATIONS query
+        @return: the notifications that were not seen before
+        """
+        added = self._merge(raw_items)
+        self._trim(now)
+        self._notify(added)
+
+        self._pending.difference_update(str(raw["id"]) for raw in raw_items)
+        if raw_items and not self._pending:
+            self._synced = True
+        return added
+
+    def _merge(self, raw_items) -> typing.List[Notification]:
+        added = []
+        for raw in raw_items:
+            notification = Notification.from_raw(raw)
+            if notification.id not in self._seen:
+                self._seen.add(notification.id)
+                added.append(notification)
+                self._items[notification.id] = notification
+            elif notification.id in self._items:
+                self._items[notification.id] = notification
+        return added
+
+    def _notify(self, added):
+        if added and self._synced and self.callbacks:
+            self.data.dispatcher.dispatch(self.callbacks, [(notification,) for notification in added])
+
+    def _trim(self, now=None):
+        now = now if now is not None else time.time()
+        horizon = now - self.max_age
+        keep = [
+            item for item in self._items.values()
+            if item.unread or (item.created_at is not None and item.created_at >= horizon)
+        ]
+        if len(keep) > self.max_items:
+            keep.sort(key=lambda item: (item.unread, item.created_at or 0.0), reverse=True)
+            keep = keep[:self.max_items]
+        if len(keep) != len(self._items):
+            self._items = {item.id: item for item in keep}
+
+    def get(self, notification_id) -> typing.Optional[Notification]:
+        return self._items.get(notification_id)
+
+    def unread(self) -> typing.List[Notification]:
+        return [item for item in self._items.values() if item.unread]
+
+    def items(self) -> typing.List[Notification]:
+        """
+        @return: the stored notifications, newest first
+        """
+        return sorted(self._items.values(), key=lambda item: item.created_at or 0.0, reverse=True)
+
+    def __len__(self):
+        return len(self._items)
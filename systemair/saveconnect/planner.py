@@ -0,0 +1,149 @@
+"""
+Route query planner.
+
+Every GetDeviceView route returns a fixed set of register addresses. SaveConnectRoutePlanner learns this coverage
+from the responses that pass through SaveConnectGraphQL.queryDeviceView, or takes it from a table, and plans the
+smallest set of routes that covers the registers a consumer is interested in.
+"""
+import json
+import logging
+import typing
+
+from .const import APIRoutes
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Routes polled for every device when no interest is declared"""
+DEFAULT_ROUTES = [
+    APIRoutes.HOME,
+    APIRoutes.VIEWS_UNIT_INFORMATION_COMPONENTS_DESC,
+    APIRoutes.VIEWS_UNIT_INFORMATION_SENSORS_DESC,
+    APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_INPUT_STATUS_DESC,
+    APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_OUTPUT_STATUS_DESC,
+    APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_DATE_TIME_TITLE,
+    APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_VERSION_DESC,
+]
+
+
+class SaveConnectRoutePlanner:
+
+    def __init__(self, routes: typing.List[str] = None, table: typing.Dict[str, typing.Iterable[int]] = None):
+        """
+        Route planner. Coverage is learned per device, as devices of different models return different registers on
+        the same route. The table is used for the routes a device has not been observed on yet.
+        @param routes: candidate routes, DEFAULT_ROUTES if None
+        @param table: optional known coverage, mapping route to the register addresses it returns
+        """
+        self.routes = list(routes) if routes is not None else list(DEFAULT_ROUTES)
+        self.coverage: typing.Dict[str, typing.Set[int]] = {
+            route: set(int(r) for r in registers) for route, registers in (table or {}).items()
+        }
+        self.devices: typing.Dict[str, typing.Dict[str, typing.Set[int]]] = dict()
+        self.interest: typing.Optional[typing.Set[int]] = None
+        self._plans: typing.Dict[typing.Optional[str], typing.List[str]] = dict()
+        self._uncovered: typing.Dict[typing.Optional[str], typing.Set[int]] = dict()
+
+    @classmethod
+    def from_file(cls, path, routes=None):
+        """
+        @param path: JSON file mapping route to a list of register addresses, e.g. written by save()
+        """
+        with open(path) as f:
+            return cls(routes=routes, table=json.load(f))
+
+    def save(self, path, device_id=None):
+        """
+        Write a coverage table to a JSON file
+        @param path:
+        @param device_id: write the coverage learned for this device, the table if None
+        """
+        with open(path, "w") as f:
+            json.dump({route: sorted(registers) for route, registers in self._coverage(device_id).items()}, f)
+
+    def set_interest(self, registers: typing.Optional[typing.Iterable[int]]):
+        """
+        Declare the registers to keep up to date. None restores polling of all routes.
+        @param registers: Register addresses
+        """
+        self.interest = set(int(r) for r in registers) if registers is not None else None
+        self._plans.clear()
+        self._uncovered.clear()
+
+    def record(self, route, registers: typing.Iterable[int], device_id=None):
+        """
+        Learn the registers returned by a route. The plan is revisited when the coverage changes.
+        @param route:
+        @param registers: the register addresses in the response
+        @param device_id: the device that was polled, None to update the table shared by all devices
+        """
+        coverage = self.coverage if device_id is None else self.devices.setdefault(device_id, dict())
+        known = coverage.setdefault(route, set())
+        before = len(known)
+        known.update(int(r) for r in registers)
+        if len(known) != before:
+            _LOGGER.debug(f"Route {route} covers {len(known)} registers (device={device_id}).")
+            if device_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(device_id, None)
+
+    def forget(self, device_id):
+        """
+        Drop the coverage learned for a device, e.g. when it is removed from the account
+        """
+        self.devices.pop(device_id, None)
+        self._plans.pop(device_id, None)
+        self._uncovered.pop(device_id, None)
+
+    def plan(self, device_id=None) -> typing.List[str]:
+        """
+        @param device_id: the device to plan for, None to plan from the table only
+        @return: the routes to poll
+        """
+        plan = self._plans.get(device_id)
+        if plan is None:
+            plan = self._plans[device_id] = self._compute(device_id)
+        return plan
+
+    @property
+    def uncovered(self) -> typing.Set[int]:
+        """Registers of interest that no known route returns, for any of the planned devices"""
+        devices = [device_id for device_id in self._plans if device_id is not None]
+        if not devices:
+            self.plan()
+            return self._uncovered[None]
+        return set().union(*(self._uncovered[device_id] for device_id in devices))
+
+    def _coverage(self, device_id) -> typing.Dict[str, typing.Set[int]]:
+        if device_id is None or device_id not in self.devices:
+            return self.coverage
+        return {**self.coverage, **self.devices[device_id]}
+
+    def _compute(self, device_id) -> typing.List[str]:
+        if self.interest is None:
+            self._uncovered[device_id] = set()
+            return list(self.routes)
+
+        coverage = self._coverage(device_id)
+
+        # Routes that have never been observed are polled until their coverage is known.
+        unknown = [route for route in self.routes if route not in coverage]
+
+        # Greedy set cover over the known routes, in the order of the candidate routes on ties.
+        remaining = set(self.interest)
+        plan = []
+        candidates = [route for route in self.routes if route in coverage]
+        while remaining and candidates:
+            best = max(candidates, key=lambda route: len(coverage[route] & remaining))
+            gain = coverage[best] & remaining
+            if not gain:
+                break
+            plan.append(best)
+            remaining -= gain
+            candidates.remove(best)
+
+        if remaining and not unknown and remaining != self._uncovered.get(device_id):
+            _LOGGER.warning(f"No route returns the registers {sorted(remaining)} (device={device_id}).")
+        self._uncovered[device_id] = remaining
+
+        return [route for route in self.routes if route in plan or route in unknown]
@@ -0,0 +1,379 @@
+"""
+Per-route poll cadence.
+
+A SaveConnectPollPolicy maps every GetDeviceView route, or a route pattern, to a PollRule with its own interval,
+jitter and priority. The SaveConnectScheduler keeps the time each (device, route) pair is due next, and the
+SaveConnect worker only polls what is due, highest priority first.
+
+The scheduler is also a SaveConnectData sink. When adaptive, it stretches the interval of routes whose polls keep
+returning unchanged values and of devices that recently pushed values over the WebSocket, and returns to the policy
+interval when values change or are written.
+
+Polls are spread over the interval: every (device, route) pair is due on a grid of the wall clock shifted by a phase
+hashed from the device id and route, so clients that start at the same time do not poll at the same time.
+
+Devices known to be offline are not polled. They are probed on an exponential backoff instead, and their routes are
+due again as soon as they are back online.
+"""
+import fnmatch
+import logging
+import random
+import typing
+import zlib
+
+from .const import APIRoutes, UpdateSource
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Pseudo route of the account query refreshing the device list"""
+ACCOUNT = "account"
+
+
+class PollRule(typing.NamedTuple):
+    pattern: str
+    interval: float
+    jitter: float = 0.0
+    priority: int = 0
+
+
+"""Rules matching how often the data of each route actually changes"""
+RECOMMENDED_RULES = [
+    PollRule(APIRoutes.HOME, 60, jitter=5, priority=10),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_SENSORS_DESC, 60, jitter=5, priority=10),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_INPUT_STATUS_DESC, 300, jitter=30, priority=5),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_OUTPUT_STATUS_DESC, 300, jitter=30, priority=5),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_COMPONENTS_DESC, 86400, jitter=3600),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_DATE_TIME_TITLE, 86400, jitter=3600),
+    PollRule(APIRoutes.VIEWS_UNIT_INFORMATION_UNIT_VERSION_DESC, 86400, jitter=3600),
+    PollRule(ACCOUNT, 3600, jitter=60, priority=20),
+]
+
+
+class SaveConnectPollPolicy:
+
+    def __init__(self, rules: typing.List[PollRule] = None, default_interval=60):
+        """
+        Poll policy. The first rule whose pattern matches a route wins.
+        @param rules: PollRules, patterns are fnmatch patterns such as /device/unit_information/*
+        @param default_interval: interval of routes no rule matches. Values <= 0 disable polling of those routes
+        """
+        self.rules = list(rules or [])
+        self.default = PollRule("*", default_interval)
+        self._cache: typing.Dict[str, PollRule] = dict()
+
+    @classmethod
+    def recommended(cls, default_interval=60):
+        return cls(RECOMMENDED_RULES, default_interval=default_interval)
+
+    def rule(self, route) -> PollRule:
+        """
+        @param route: a route, or ACCOUNT for the account query
+        @return: the rule applying to the route
+        """
+        rule = self._cache.get(route)
+        if rule is None:
+            rule = next((r for r in self.rules if fnmatch.fnmatchcase(route, r.pattern)), self.default)
+            self._cache[route] = rule
+        return rule
+
+    def requests_per_hour(self, routes: typing.Iterable[str], devices=1) -> float:
+        """
+        Expected number of requests per hour, ignoring failures
+        @param routes: the routes polled per device
+        @param devices: number of devices on the account
+        """
+        rate = sum(3600 / self.rule(route).interval for route in routes if self.rule(route).interval > 0) * devices
+        account = self.rule(ACCOUNT).interval
+        return rate + (3600 / account if account > 0 else 0)
+
+
+class SaveConnectSchedulerStats:
+
+    def __init__(self):
+        self.polls = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.pushes = 0
+        self.writes = 0
+        self.skipped = 0
+        self.probes = 0
+        self.probe_time = 0.0
+        self.offline_time = 0.0
+
+    def dict(self):
+        return dict(
+            polls=self.polls,
+            changed=self.changed,
+            unchanged=self.unchanged,
+            pushes=self.pushes,
+            writes=self.writes,
+            skipped=self.skipped,
+            probes=self.probes,
+            probe_time=self.probe_time,
+            offline_time=self.offline_time
+        )
+
+
+class SaveConnectOfflineDevice:
+    __slots__ = ("since", "next_probe", "backoff", "probes")
+
+    def __init__(self, since, next_probe, backoff):
+        self.since = since
+        self.next_probe = next_probe
+        self.backoff = backoff
+        self.probes = 0
+
+
+class SaveConnectScheduler:
+
+    def __init__(self, policy: SaveConnectPollPolicy, backoff=1.0, max_factor=8.0, max_interval=3600,
+                 push_window=300, push_factor=1.0, probe_interval=60, max_probe_interval=3600, spread=True):
+        """
+        Keeps the time every (device, route) pair is due next. With the defaults the intervals of the policy are used
+        as they are, see adaptive() for a scheduler that adapts them.
+        @param policy: the SaveConnectPollPolicy
+        @param backoff: factor the interval of a route grows by with every poll that returned no changed value
+        @param max_factor: upper bound of the grown factor
+        @param max_interval: stretched intervals are not grown beyond this, unless the policy interval is longer
+        @param push_window: time after a WebSocket push during which a device counts as pushing
+        @param push_factor: factor the intervals of a pushing device are stretched by
+        @param probe_interval: first interval an offline device is probed at, doubled after every failed probe
+        @param max_probe_interval: upper bound of the probe interval
+        @param spread: poll on a grid shifted by a phase hashed from the device id and route, instead of one interval
+        after the previous poll. The random jitter of the poll rules is added on top.
+        """
+        self.policy = policy
+        self.backoff = backoff
+        self.max_factor = max_factor
+        self.max_interval = max_interval
+        self.push_window = push_window
+        self.push_factor = push_factor
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.spread = spread
+
+        self.stats = SaveConnectSchedulerStats()
+
+        self._next: typing.Dict[typing.Tuple[str, str], float] = dict()
+        self._factor: typing.Dict[typing.Tuple[str, str], float] = dict()
+        self._last_push: typing.Dict[str, float] = dict()
+        self._polled: typing.Dict[str, bool] = dict()
+        self._offline: typing.Dict[str, SaveConnectOfflineDevice] = dict()
+        self._phase: typing.Dict[typing.Tuple[str, str], float] = dict()
+
+    @classmethod
+    def adaptive(cls, policy: SaveConnectPollPolicy, **kwargs):
+        """
+        Scheduler backing off stable routes by 1.5 per unchanged poll and pushing devices by 4
+        """
+        kwargs.setdefault("backoff", 1.5)
+        kwargs.setdefault("push_factor", 4.0)
+        return cls(policy, **kwargs)
+
+    def on_update(self, device_id, changes, timestamp, source):
+        if source == UpdateSource.POLL:
+            # Read by mark() right after the poll that caused the update
+            self._polled[device_id] = self._polled.get(device_id, False) or any(c.changed for c in changes)
+        elif source == UpdateSource.WS:
+            self._last_push[device_id] = timestamp
+            self.stats.pushes += 1
+        elif source == UpdateSource.WRITE:
+            self.stats.writes += 1
+            self.reset(device_id, timestamp)
+
+    def due(self, device_id, routes: typing.Iterable[str], now) -> typing.List[str]:
+        """
+        Routes of a device that are due. A pair that is seen for the first time is due after one interval.
+        @param device_id: device id, or ACCOUNT for the account query
+        @param routes: the routes to consider
+        @param now: current time
+        @return: the due routes, highest priority first
+        """
+        due = []
+        for route in routes:
+            rule = self.policy.rule(route)
+            if rule.interval <= 0:
+                continue
+            next_time = self._next.get((device_id, route))
+            if next_time is None:
+                self._schedule(device_id, route, rule, now)
+            elif next_time <= now:
+                due.append(route)
+        due.sort(key=lambda route: -self.policy.rule(route).priority)
+        return due
+
+    def polling(self, device_id):
+        """
+        Clear the changed flag of a device right before one of its routes is polled, so mark() only accounts the
+        updates of that poll
+        """
+        self._polled.pop(device_id, None)
+
+    def mark(self, device_id, route, now):
+        """
+        Record that a route was polled and schedule the next poll. The interval of the route grows when the poll
+        returned no changed value and is reset when it did. Routes whose interval is <= 0 are not scheduled.
+        """
+        changed = self._polled.pop(device_id, None)
+        if changed is not None:
+            self.stats.polls += 1
+            key = (device_id, route)
+            if changed:
+                self.stats.changed += 1
+                self._factor.pop(key, None)
+            else:
+                self.stats.unchanged += 1
+                if self.backoff > 1:
+                    self._factor[key] = min(self._factor.get(key, 1.0) * self.backoff, self.max_factor)
+        self._schedule(device_id, route, self.policy.rule(route), now)
+
+    def reset(self, device_id, now):
+        """
+        Return all routes of a device to the policy interval, e.g. after a write
+        """
+        for key in [key for key in self._factor if key[0] == device_id]:
+            del self._factor[key]
+        for key, next_time in self._next.items():
+            if key[0] == device_id:
+                self._next[key] = min(next_time, now + self.policy.rule(key[1]).interval)
+
+    def offline(self, device_id, now):
+        """
+        Stop polling a device and probe it on an exponential backoff instead
+        """
+        if device_id not in self._offline:
+            _LOGGER.debug(f"Device {device_id} is offline, probing it every {self.probe_interval}s and longer.")
+            self._offline[device_id] = SaveConnectOfflineDevice(now, now + self.probe_interval, self.probe_interval)
+
+    def online(self, device_id, now):
+        """
+        Resume polling a device. All its routes are due immediately.
+        """
+        state = self._offline.pop(device_id, None)
+        if state is None:
+            return
+        _LOGGER.debug(f"Device {device_id} is back online after {now - state.since:.0f}s and {state.probes} probes.")
+        self.stats.offline_time += now - state.since
+        for key in self._next:
+            if key[0] == device_id:
+                self._next[key] = now
+
+    def is_offline(self, device_id) -> bool:
+        return device_id in self._offline
+
+    def skip(self, device_id, routes: typing.Iterable[str], now):
+        """
+        Reschedule due routes of an offline device without polling them
+        """
+        for route in routes:
+            self.stats.skipped += 1
+            self._schedule(device_id, route, self.policy.rule(route), now)
+
+    def probe_due(self, device_id, now) -> bool:
+        state = self._offline.get(device_id)
+        return state is not None and state.next_probe <= now
+
+    def probed(self, device_id, now, success, duration):
+        """
+        Record a probe of an offline device. The device is online again if it succeeded, otherwise the probe interval
+        is doubled.
+        @param duration: time the probe took
+        """
+        # The probe is not accounted to the route that is marked next
+        self._polled.pop(device_id, None)
+        state = self._offline.get(device_id)
+        if state is None:
+            return
+        state.probes += 1
+        self.stats.probes += 1
+        self.stats.probe_time += duration
+        if success:
+            self.online(device_id, now)
+        else:
+            state.backoff = min(state.backoff * 2, self.max_probe_interval)
+            state.next_probe = now + state.backoff
+
+    def interval(self, device_id, route, now) -> float:
+        """
+        @return: the current interval of a route of a device
+        """
+        base = self.policy.rule(route).interval
+        factor = self._factor.get((device_id, route), 1.0)
+        if self.is_pushing(device_id, now):
+            factor *= self.push_factor
+        if factor <= 1:
+            return base
+        return max(base, min(base * factor, self.max_interval))
+
+    def is_pushing(self, device_id, now) -> bool:
+        last_push = self._last_push.get(device_id)
+        return last_push is not None and now - last_push < self.push_window
+
+    def next_time(self, device_id, route) -> typing.Optional[float]:
+        return self._next.get((device_id, route))
+
+    def device_status(self, device_id, now) -> dict:
+        """
+        @return: the schedule of a device, i.e. whether it is offline or pushing, and the interval and next due time
+        per route
+        """
+        last_push = self._last_push.get(device_id)
+        offline = self._offline.get(device_id)
+        return dict(
+            offline=offline is not None,
+            offline_since=offline.since if offline else None,
+            next_probe=offline.next_probe if offline else None,
+            pushing=self.is_pushing(device_id, now),
+            last_push=last_push,
+            routes={
+                route: dict(
+                    interval=self.interval(device_id, route, now),
+                    factor=self._factor.get((device_id, route), 1.0),
+                    next=next_time
+                )
+                for (key_device, route), next_time in self._next.items() if key_device == device_id
+            }
+        )
+
+    def metrics(self, now) -> dict:
+        """
+        @return: the counters and the status of every scheduled device
+        """
+        devices = sorted(set(device_id for device_id, _ in self._next if device_id != ACCOUNT))
+        return dict(
+            **self.stats.dict(),
+            devices={device_id: self.device_status(device_id, now) for device_id in devices}
+        )
+
+    def forget(self, device_id):
+        """
+        Drop the schedule of a device, e.g. when it is removed from the account
+        """
+        for schedule in (self._next, self._factor, self._phase):
+            for key in [key for key in schedule if key[0] == device_id]:
+                del schedule[key]
+        self._last_push.pop(device_id, None)
+        self._polled.pop(device_id, None)
+        self._offline.pop(device_id, None)
+
+    def phase(self, device_id, route) -> float:
+        """
+        @return: the fraction of the interval a (device, route) pair is shifted by, stable across processes
+        """
+        key = (device_id, route)
+        phase = self._phase.get(key)
+        if phase is None:
+            phase = self._phase[key] = zlib.crc32(f"{device_id}{route}".encode()) / 2 ** 32
+        return phase
+
+    def _schedule(self, device_id, route, rule: PollRule, now):
+        interval = self.interval(device_id, route, now)
+        if interval <= 0:
+            # Polling of the route is disabled, e.g. the ACCOUNT rule with update_interval=0
+            self._next.pop((device_id, route), None)
+            return
+        next_time = now + interval
+        if self.spread:
+            # The only grid point in (now, now + interval]
+            next_time -= (next_time - self.phase(device_id, route) * interval) % interval
+        self._next[(device_id, route)] = next_time + (random.uniform(0, rule.jitter) if rule.jitter else 0)
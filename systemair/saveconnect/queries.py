@@ -0,0 +1,141 @@
+"""
+GraphQL documents of the gateway API.
+
+Every poll posts the query text, so the selection sets are chosen per use case and the documents are sent with
+collapsed whitespace. The full selections are kept for callers that need the view layout or the account profile.
+"""
+import functools
+import hashlib
+import typing
+
+
+def compact(document: str) -> str:
+    """
+    @return: the document with collapsed whitespace
+    """
+    return " ".join(document.split())
+
+
+@functools.lru_cache(maxsize=None)
+def query_hash(document: str) -> str:
+    """
+    @return: the sha256 hex digest identifying the document as an automatic persisted query
+    """
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+class ViewSelection:
+    """Selection sets of GetDeviceView"""
+    FULL = "full"
+    DATA = "data"
+
+
+class AccountSelection:
+    """Selection sets of GetAccount"""
+    FULL = "full"
+    DEVICES = "devices"
+    """Devices and the id and unread flag of every notification, for routine refreshes"""
+    ROUTINE = "routine"
+    """The full notifications only"""
+    NOTIFICATIONS = "notifications"
+
+
+_DEVICE = """
+    name
+    identifier
+    connectionStatus
+    startupWizardRequired
+    updateInProgress
+    units {
+      temperature
+      pressure
+      flow
+    }
+    street
+    zipcode
+    city
+    country
+    serviceLocked
+    filterLocked
+    weekScheduleLocked
+    hasAlarms
+"""
+
+DEVICE_VIEW_SELECTIONS = {
+    ViewSelection.FULL: "route elements dataItems title translationVariables",
+    ViewSelection.DATA: "route dataItems",
+}
+
+_NOTIFICATION = """
+    id
+    title
+    description
+    type
+    unread
+    email
+    properties
+    createdAt
+"""
+
+ACCOUNT_SELECTIONS = {
+    AccountSelection.FULL: f"""
+        email
+        firstName
+        lastName
+        city
+        country
+        locale
+        phoneNumber
+        street
+        role
+        zipCode
+        permissions
+        exists
+        disabled
+        devices {{ {_DEVICE} }}
+        notifications {{ {_NOTIFICATION} }}
+        company {{
+          companyName
+          referenceEmail
+          referenceName
+          responsiblePerson
+          responsiblePersonPhoneNumber
+        }}
+    """,
+    AccountSelection.DEVICES: f"devices {{ {_DEVICE} }}",
+    AccountSelection.ROUTINE: f"devices {{ {_DEVICE} }} notifications {{ id unread }}",
+    AccountSelection.NOTIFICATIONS: f"notifications {{ {_NOTIFICATION} }}",
+}
+
+WRITE_DEVICE_VALUES = compact("""
+    mutation ($input: WriteDeviceValuesInputType!) {
+      WriteDeviceValues(input: $input)
+    }
+""")
+
+
+def device_view_query(selection=ViewSelection.DATA) -> str:
+    """
+    @param selection: one of ViewSelection
+    @return: the GetDeviceView document
+    """
+    return _DEVICE_VIEW_QUERIES[selection]
+
+
+def account_query(selection=AccountSelection.ROUTINE) -> str:
+    """
+    @param selection: one of AccountSelection
+    @return: the GetAccount document
+    """
+    return _ACCOUNT_QUERIES[selection]
+
+
+_DEVICE_VIEW_QUERIES: typing.Dict[str, str] = {
+    name: compact(f"mutation ($input: GetDeviceViewInput!) {{ GetDeviceView(input: $input) {{ {fields} }} }}")
+    for name, fields in DEVICE_VIEW_SELECTIONS.items()
+}
+
+_ACCOUNT_QUERIES: typing.Dict[str, str] = {
+    name: compact(f"{{ GetAccount {{ {fields} }} }}")
+    for name, fields in ACCOUNT_SELECTIONS.items()
+}
@@ -1344,685 +1344,257 @@ class Register:
         "30104": "REG_USER_SAFE_CONFIG_VALID",
         "242424": "REG_USERMODE_DUMMY_MANUAL"
 }
+import copy
+import copyreg
+import time
 import typing
 
-from pydantic import BaseModel
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
-class SaveConnectRegistry(BaseModel):
+class SaveConnectRegistry:
+    """
+    Sparse registry of the registers reported by a device.
 
-    IAM_HEARTBEAT: "SaveConnectRegisterItem" = None
-    REG_DEMC_RH_SETTINGS_PBAND: "SaveConnectRegisterItem" = None
-    REG_DEMC_RH_SETTINGS_ITIME: "SaveConnectRegisterItem" = None
-    REG_DEMC_RH_SETTINGS_SP_SUMMER: "SaveConnectRegisterItem" = None
-    REG_DEMC_RH_SETTINGS_SP_WINTER: "SaveConnectRegisterItem" = None
-    REG_DEMC_RH_SETTINGS_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_STATUS: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_CTRL: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_TRANSFER_STATE: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_TRANSFER_ERROR_CODE: "SaveConnectRegisterItem" = None
-    REG_DEMC_CO2_SETTINGS_PBAND: "SaveConnectRegisterItem" = None
-    REG_DEMC_CO2_SETTINGS_ITIME: "SaveConnectRegisterItem" = None
-    REG_DEMC_CO2_SETTINGS_SP: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_FILENAME_1: "SaveConnectRegisterItem" = None
-    REG_DEMC_CO2_SETTINGS_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_CFG_STORAGE_TRANSFER_PROGRESS: "SaveConnectRegisterItem" = None
-    REG_USERMODE_HOLIDAY_TIME: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AWAY_TIME: "SaveConnectRegisterItem" = None
-    REG_USERMODE_FIREPLACE_TIME: "SaveConnectRegisterItem" = None
-    REG_USERMODE_REFRESH_TIME: "SaveConnectRegisterItem" = None
-    REG_USERMODE_CROWDED_TIME: "SaveConnectRegisterItem" = None
-    REG_USERMODE_REMAINING_TIME_L: "SaveConnectRegisterItem" = None
-    REG_IAQ_SPEED_LEVEL_MIN: "SaveConnectRegisterItem" = None
-    REG_IAQ_SPEED_LEVEL_MAX: "SaveConnectRegisterItem" = None
-    REG_IAQ_LEVEL: "SaveConnectRegisterItem" = None
-    REG_USERMODE_MANUAL_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_MANUAL_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AUTO_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AUTO_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_CROWDED_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_CROWDED_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_REFRESH_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_REFRESH_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_FIREPLACE_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_FIREPLACE_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AWAY_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AWAY_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_HOLIDAY_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_HOLIDAY_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_COOKERHOOD_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_COOKERHOOD_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_VACUUMCLEANER_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_VACUUMCLEANER_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_CROWDED_T_OFFSET: "SaveConnectRegisterItem" = None
-    REG_USERMODE_MODE: "SaveConnectRegisterItem" = None
-    REG_USERMODE_HMI_CHANGE_REQUEST: "SaveConnectRegisterItem" = None
-    REG_USERMODE_FALLBACK: "SaveConnectRegisterItem" = None
-    REG_USERMODE_MODE_HMI: "SaveConnectRegisterItem" = None
-    REG_HMI_USERMODE_COUNTER: "SaveConnectRegisterItem" = None
-    REG_CDI_1_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_CDI_1_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_CDI_2_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_CDI_2_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_CDI_3_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_CDI_3_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_PRESSURE_GUARD_AIRFLOW_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_PRESSURE_GUARD_AIRFLOW_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_USERMODE_HOLIDAY_DI_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_USERMODE_AWAY_DI_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_USERMODE_FIREPLACE_DI_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_USERMODE_REFRESH_DI_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_USERMODE_CROWDED_DI_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_CDI1_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_CDI2_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_CDI3_OFF_DELAY: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_TYPE: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_RESULT: "SaveConnectRegisterItem" = None
-    REG_FAN_REGULATION_UNIT: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_VALUE_WINTER: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_VALUE: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_STOP_T_WINTER: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_START_T_WINTER: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_START_T_SUMMER: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_STOP_T_SUMMER: "SaveConnectRegisterItem" = None
-    REG_FAN_OUTDOOR_COMP_VALUE_SUMMER: "SaveConnectRegisterItem" = None
-    REG_FAN_REGULATION_PBAND: "SaveConnectRegisterItem" = None
-    REG_FAN_REGULATION_ITIME: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MIN: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MIN: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_LOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_LOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_NORMAL: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_NORMAL: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_HIGH: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_HIGH: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MAX: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MAX: "SaveConnectRegisterItem" = None
-    REG_FAN_MANUAL_STOP_ALLOWED: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MIN_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MIN_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_LOW_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_LOW_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_NORMAL_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_NORMAL_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_HIGH_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_HIGH_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MAX_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MAX_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MIN_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MIN_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_LOW_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_LOW_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_NORMAL_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_NORMAL_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_HIGH_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_HIGH_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MAX_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MAX_RPM: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MIN_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MIN_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_LOW_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_LOW_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_NORMAL_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_NORMAL_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_HIGH_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_HIGH_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MAX_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MAX_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MIN_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MIN_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_LOW_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_LOW_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_NORMAL_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_NORMAL_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_HIGH_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_HIGH_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_SAF_MAX_FLOW: "SaveConnectRegisterItem" = None
-    REG_FAN_LEVEL_EAF_MAX_FLOW: "SaveConnectRegisterItem" = None
-    REG_IAM_UPDATE_PROCESS_STATE: "SaveConnectRegisterItem" = None
-    REG_IAM_UPDATE_PROCESS_CURRENT_FILE: "SaveConnectRegisterItem" = None
-    REG_IAM_UPDATE_PROCESS_CURRENT_FILE_TRANSFER_PERCENTAGE: "SaveConnectRegisterItem" = None
-    REG_SPEED_INDICATION_APP: "SaveConnectRegisterItem" = None
-    REG_TC_SP: "SaveConnectRegisterItem" = None
-    REG_TC_CASCADE_PBAND: "SaveConnectRegisterItem" = None
-    REG_TC_CASCADE_ITIME: "SaveConnectRegisterItem" = None
-    REG_TC_CASCADE_SP_MIN: "SaveConnectRegisterItem" = None
-    REG_TC_CASCADE_SP_MAX: "SaveConnectRegisterItem" = None
-    REG_TC_CONTROL_MODE: "SaveConnectRegisterItem" = None
-    REG_TC_CONTROL_PBAND: "SaveConnectRegisterItem" = None
-    REG_TC_CONTROL_ITIME: "SaveConnectRegisterItem" = None
-    REG_INPUT_EXTERNAL_CTRL_SAF: "SaveConnectRegisterItem" = None
-    REG_INPUT_EXTERNAL_CTRL_EAF: "SaveConnectRegisterItem" = None
-    REG_HEATER_SATC_MIN: "SaveConnectRegisterItem" = None
-    REG_HEATER_SATC_MAX: "SaveConnectRegisterItem" = None
-    REG_HEATER_CIRC_PUMP_START_T: "SaveConnectRegisterItem" = None
-    REG_HEATER_CIRC_PUMP_STOP_DELAY: "SaveConnectRegisterItem" = None
-    REG_HEAT_EXCHANGER_SATC_MIN: "SaveConnectRegisterItem" = None
-    REG_HEAT_EXCHANGER_SATC_MAX: "SaveConnectRegisterItem" = None
-    REG_HEAT_EXCHANGER_TYPE: "SaveConnectRegisterItem" = None
-    REG_HEAT_EXCHANGER_COOLING_RECOVERY_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_PWM_TRIAC_OUTPUT: "SaveConnectRegisterItem" = None
-    REG_ROTOR_RH_TRANSFER_CTRL_PBAND: "SaveConnectRegisterItem" = None
-    REG_ROTOR_RH_TRANSFER_CTRL_ITIME: "SaveConnectRegisterItem" = None
-    REG_ROTOR_RH_TRANSFER_CTRL_SETPOINT: "SaveConnectRegisterItem" = None
-    REG_ROTOR_RH_TRANSFER_CTRL_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_PASSIVE_HOUSE_CERTIFICATION: "SaveConnectRegisterItem" = None
-    REG_PASSIVE_HOUSE_MAX_LIMIT: "SaveConnectRegisterItem" = None
-    REG_PASSIVE_HOUSE_ACTIVATION: "SaveConnectRegisterItem" = None
-    REG_COOLER_SATC_MIN: "SaveConnectRegisterItem" = None
-    REG_COOLER_SATC_MAX: "SaveConnectRegisterItem" = None
-    REG_COOLER_CIRC_PUMP_START_T: "SaveConnectRegisterItem" = None
-    REG_COOLER_RECOVERY_LIMIT_T: "SaveConnectRegisterItem" = None
-    REG_COOLER_OAT_INTERLOCK_T: "SaveConnectRegisterItem" = None
-    REG_COOLER_CIRC_PUMP_STOP_DELAY: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_SET_PI_PBAND: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_SET_PI_ITIME: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_SET_PI_SETPOINT: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_CIRC_PUMP_START_T: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_CIRC_PUMP_STOP_DELAY: "SaveConnectRegisterItem" = None
-    REG_EXTRA_CONTROLLER_PREHEATER_SETPOINT_TYPE: "SaveConnectRegisterItem" = None
-    REG_CHANGE_OVER_CIRC_PUMP_START_T: "SaveConnectRegisterItem" = None
-    REG_CHANGE_OVER_CIRC_PUMP_STOP_DELAY: "SaveConnectRegisterItem" = None
-    REG_ECO_T_Y1_OFFSET: "SaveConnectRegisterItem" = None
-    REG_ECO_MODE_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_SEC_AIR: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_REHEATER_TYPE: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_BYPASS_LOCATION: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_COOLER: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_EXTRA_CONTROLLER: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_PREHEATER: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_RHS_PDM: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_COOLING: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_FREE_COOLING: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_HEATING: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_DEFROSTING: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_HEAT_RECOVERY: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_COOLING_RECOVERY: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_MOISTURE_TRANSFER: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_SECONDARY_AIR: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_VACUUM_CLEANER: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_COOKER_HOOD: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_USER_LOCK: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_ECO_MODE: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_HEATER_COOL_DOWN: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_PRESSURE_GUARD: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_CDI_1: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_CDI_2: "SaveConnectRegisterItem" = None
-    REG_FUNCTION_ACTIVE_CDI_3: "SaveConnectRegisterItem" = None
-    REG_UNIT_CONFIG_BYF: "SaveConnectRegisterItem" = None
-    REG_DEFROSTING_MODE: "SaveConnectRegisterItem" = None
-    REG_DEFROSTING_DISABLE: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_ON_OFF: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_OUTDOOR_DAYTIME_T: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_OUTDOOR_NIGHTTIME_DEACTIVATION_HIGH_T_LIMIT: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_OUTDOOR_NIGHTTIME_DEACTIVATION_LOW_T_LIMIT: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_ROOM_CANCEL_T: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_START_TIME_H: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_END_TIME_H: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_MIN_SPEED_LEVEL_SAF: "SaveConnectRegisterItem" = None
-    REG_FREE_COOLING_MIN_SPEED_LEVEL_EAF: "SaveConnectRegisterItem" = None
-    REG_WS_T_OFFSET_ACTIVE: "SaveConnectRegisterItem" = None
-    REG_WS_T_OFFSET_INACTIVE: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD1_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD1_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD1_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD1_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD2_START_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD2_START_M: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD2_END_H: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD2_END_M: "SaveConnectRegisterItem" = None
-    REG_WS_FAN_LEVEL_SCHEDULED: "SaveConnectRegisterItem" = None
-    REG_WS_FAN_LEVEL_UNSCHEDULED: "SaveConnectRegisterItem" = None
-    REG_WS_ANY_DEFINED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY1_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY2_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY3_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY4_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY5_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY6_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_WS_DAY7_PRD2_ENABLED: "SaveConnectRegisterItem" = None
-    REG_TIME_YEAR: "SaveConnectRegisterItem" = None
-    REG_FILTER_PERIOD: "SaveConnectRegisterItem" = None
-    REG_FILTER_PERIOD_SET: "SaveConnectRegisterItem" = None
-    REG_FILTER_REMAINING_TIME_L: "SaveConnectRegisterItem" = None
-    REG_FILTER_KIT_INDEX: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_COUNTRY: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_ITEM_NUMBER1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_COMPANY1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_TELEPHONE1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_HOMEPAGE1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_EMAIL1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_UNIT_MODEL1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_SERIAL_NUMBER1: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_UNIT_MODEL_TYPE: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_UNIT_FLOW: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_UNIT_PRESSURE: "SaveConnectRegisterItem" = None
-    REG_SYSTEM_UNIT_TEMPERATURE: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC1: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC2: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC3: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC4: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC5: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC6: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CONNECTION_NTC7: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC1: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC2: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC3: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC4: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC5: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC6: "SaveConnectRegisterItem" = None
-    REG_AI_CFG_CORRECTION_NTC7: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_1: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_2: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_3: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_4: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_5: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_TYPE_6: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG1: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG2: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG3: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG4: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG5: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_ANALOG6: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG1: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG2: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG3: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG4: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG5: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_CORRECTION_ANALOG6: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL1: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL2: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL3: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL4: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL5: "SaveConnectRegisterItem" = None
-    REG_UI_CONNECTION_DIGITAL6: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL1: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL2: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL3: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL4: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL5: "SaveConnectRegisterItem" = None
-    REG_UI_CFG_POLARITY_DIGITAL6: "SaveConnectRegisterItem" = None
-    REG_DI_CONNECTION_1: "SaveConnectRegisterItem" = None
-    REG_DI_CONNECTION_2: "SaveConnectRegisterItem" = None
-    REG_DI_CFG_POLARITY_1: "SaveConnectRegisterItem" = None
-    REG_DI_CFG_POLARITY_2: "SaveConnectRegisterItem" = None
-    REG_PDM_CORRECTION_RH: "SaveConnectRegisterItem" = None
-    REG_PDM_CORRECTION_T: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_1: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_2: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_3: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_4: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_5: "SaveConnectRegisterItem" = None
-    REG_INPUT_ANALOG_UI_6: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_1: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_2: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_3: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_4: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_5: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_UI_6: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_DI_1: "SaveConnectRegisterItem" = None
-    REG_INPUT_DIGITAL_DI_2: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_1: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_2: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_3: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_4: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_5: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S_6: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_1: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_2: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_3: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_4: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_5: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_6: "SaveConnectRegisterItem" = None
-    REG_SENSOR_FPT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_OAT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_SAT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RAT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_EAT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_ECT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_EFT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_OHT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS: "SaveConnectRegisterItem" = None
-    REG_SENSOR_BYS: "SaveConnectRegisterItem" = None
-    REG_SENSOR_EMT: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RGS: "SaveConnectRegisterItem" = None
-    REG_SENSOR_CO2S: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RHS_PDM: "SaveConnectRegisterItem" = None
-    REG_SENSOR_P_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_P_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_FLOW_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_FLOW_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RPM_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_RPM_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_FLOW_PIGGYBACK_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_FLOW_PIGGYBACK_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_DI_BYF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PDM_EAT_CONFIGURED: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PDM_EAT_VALUE: "SaveConnectRegisterItem" = None
-    REG_ALARM_FLOW_MIN_SAF: "SaveConnectRegisterItem" = None
-    REG_ALARM_PRESSURE_SENSOR_MIN_SAF: "SaveConnectRegisterItem" = None
-    REG_ALARM_FLOW_MIN_EAF: "SaveConnectRegisterItem" = None
-    REG_ALARM_PRESSURE_SENSOR_MIN_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_AT_0V_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_AT_10V_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_ALARM_SAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_AT_0V_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_AT_10V_EAF: "SaveConnectRegisterItem" = None
-    REG_SENSOR_PRESSURE_ALARM_EAF: "SaveConnectRegisterItem" = None
-    REG_AO_CFG_CONNECTION_1: "SaveConnectRegisterItem" = None
-    REG_AO_CFG_CONNECTION_2: "SaveConnectRegisterItem" = None
-    REG_AO_CFG_CONNECTION_3: "SaveConnectRegisterItem" = None
-    REG_AO_CFG_CONNECTION_4: "SaveConnectRegisterItem" = None
-    REG_AO_CFG_CONNECTION_5: "SaveConnectRegisterItem" = None
-    REG_CFG_HEATER_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_HEAT_EXCHANGER_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_COOLER_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_EXTRA_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_CHANGE_OVER_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_AO_T_SP_ACTUATOR_TYPE: "SaveConnectRegisterItem" = None
-    REG_CFG_AO_T_SP_LOW_VALUE: "SaveConnectRegisterItem" = None
-    REG_CFG_AO_T_SP_HIGH_VALUE: "SaveConnectRegisterItem" = None
-    REG_CFG_AO_T_SP_TYPE: "SaveConnectRegisterItem" = None
-    REG_AO_T_SP_VALUE: "SaveConnectRegisterItem" = None
-    REG_DO_CFG_CONNECTION_1: "SaveConnectRegisterItem" = None
-    REG_DO_CFG_CONNECTION_2: "SaveConnectRegisterItem" = None
-    REG_DO_CFG_CONNECTION_3: "SaveConnectRegisterItem" = None
-    REG_DO_CFG_CONNECTION_4: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_TRIAC_CONFIGURED: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO1: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO2: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO3: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO4: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO5: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO1: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO2: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO3: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO4: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_TRIAC: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_SAF: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_EAF: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO1_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO2_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO3_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO4_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_AO5_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO1_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO2_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO3_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_DO4_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_TRIAC_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_SAF_VALUE: "SaveConnectRegisterItem" = None
-    REG_MANUAL_OVERRIDE_OUTPUT_EAF_VALUE: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_SAF: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_EAF: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_AO1: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_AO2: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_AO3: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_AO4: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_AO5: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_DO1: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_DO2: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_DO3: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_DO4: "SaveConnectRegisterItem" = None
-    REG_OUTPUT_TRIAC: "SaveConnectRegisterItem" = None
-    REG_K_FACTOR_SAF: "SaveConnectRegisterItem" = None
-    REG_K_FACTOR_EAF: "SaveConnectRegisterItem" = None
-    REG_PDM_CONNECTED_RH: "SaveConnectRegisterItem" = None
-    REG_PDM_CONNECTED_T: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_CTRL_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_CTRL_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_CTRL_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_CTRL_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_CTRL_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_CTRL_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FROST_PROT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_FROST_PROT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FROST_PROT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_DEFROSTING_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_DEFROSTING_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_DEFROSTING_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_RPM_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_RPM_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_RPM_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_RPM_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_RPM_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_RPM_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FPT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_FPT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FPT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_OAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_RAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_ECT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_ECT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_ECT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EFT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EFT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EFT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OHT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_OHT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OHT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EMT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EMT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EMT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RGS_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_RGS_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RGS_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYS_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYS_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYS_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SECONDARY_AIR_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_SECONDARY_AIR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SECONDARY_AIR_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTRA_CONTROLLER_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTRA_CONTROLLER_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTRA_CONTROLLER_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTERNAL_STOP_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTERNAL_STOP_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTERNAL_STOP_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RH_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_RH_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_RH_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_CO2_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_CO2_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_CO2_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOW_SAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOW_SAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOW_SAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYF_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYF_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYF_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_RHS_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_RHS_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_RHS_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_EAT_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_EAT_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_EAT_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_MANUAL_FAN_STOP_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_MANUAL_FAN_STOP_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_MANUAL_FAN_STOP_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OVERHEAT_TEMPERATURE_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_OVERHEAT_TEMPERATURE_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_OVERHEAT_TEMPERATURE_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FIRE_ALARM_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_FIRE_ALARM_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FIRE_ALARM_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_WARNING_ERROR: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_WARNING_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_WARNING_CLEAR_ALARM: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_CTRL_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_CTRL_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_FROST_PROT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_DEFROSTING_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAF_RPM_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAF_RPM_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_FPT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_OAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_SAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_RAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_ECT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EFT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_OHT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EMT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_RGS_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYS_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_SECONDARY_AIR_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTRA_CONTROLLER_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_EXTERNAL_STOP_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_RH_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_CO2_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOW_SAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_FIRE_ALARM_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_BYF_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_RHS_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_PDM_EAT_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_MANUAL_FAN_STOP_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_OVERHEAT_TEMPERATURE_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_FILTER_WARNING_TIMESTAMP_L: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_ID: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_STATE_NOW: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_STATE_PREVIOUS: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_YEAR: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_MONTH: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_DAY: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_HOUR: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_MINUTE: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_SECOND: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_1_CODE: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_ID: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_STATE_NOW: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_STATE_PREVIOUS: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_YEAR: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_MONTH: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_DAY: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_HOUR: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_MINUTE: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_SECOND: "SaveConnectRegisterItem" = None
-    REG_ALARM_LOG_20_CODE: "SaveConnectRegisterItem" = None
-    REG_ALARM_TYPE_A: "SaveConnectRegisterItem" = None
-    REG_ALARM_TYPE_B: "SaveConnectRegisterItem" = None
-    REG_ALARM_TYPE_C: "SaveConnectRegisterItem" = None
-    REG_PASSWD_ADMIN: "SaveConnectRegisterItem" = None
-    REG_LOCKED_USER: "SaveConnectRegisterItem" = None
-    REG_LOCKED_FILTER: "SaveConnectRegisterItem" = None
-    REG_LOCKED_WEEK_SCHEDULE: "SaveConnectRegisterItem" = None
-    REG_PASSWD_PC_SETTINGS: "SaveConnectRegisterItem" = None
-    REG_PASSWD_PC_UNLOCKED: "SaveConnectRegisterItem" = None
-    REG_SUW_REQUIRED: "SaveConnectRegisterItem" = None
-    REG_COMM_MODBUS_ADDRESS: "SaveConnectRegisterItem" = None
-    REG_COMM_MODBUS_BAUD_RATE: "SaveConnectRegisterItem" = None
-    REG_COMM_MODBUS_PARITY: "SaveConnectRegisterItem" = None
-    REG_COMM_MODBUS_STOP_BITS: "SaveConnectRegisterItem" = None
-    REG_COMM_MODBUS_SMARTLY_GATEWAY_STATE: "SaveConnectRegisterItem" = None
-    REG_COMM_DEBUG_SET_TO_STREAMING: "SaveConnectRegisterItem" = None
-    REG_COMM_M3B_SET_TO_MODBUS: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MAJOR: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MAJOR_HMI: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MAJOR_IAM: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MINOR: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MINOR_HMI: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_MINOR_IAM: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_BUILD: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_BUILD_HMI: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_VERSION_BUILD_IAM: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_RESOURCES_MAJOR: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_RESOURCES_MINOR: "SaveConnectRegisterItem" = None
-    REG_PU_RUNNING_RESOURCES_BUILD: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_MB_MAJOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_MB_MINOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_MB_BUILD: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_HMI_MAJOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_HMI_MINOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_VERSION_HMI_BUILD: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_HMI_RESOURCES_MAJOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_HMI_RESOURCES_MINOR: "SaveConnectRegisterItem" = None
-    REG_PU_FLASH_HMI_RESOURCES_BUILD: "SaveConnectRegisterItem" = None
-    REG_PU_UPDATE_SOURCE: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE1: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE2: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE3: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE4: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE5: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE6: "SaveConnectRegisterItem" = None
-    REG_DIRTY_NTC_VOLTAGE7: "SaveConnectRegisterItem" = None
-    REG_FACTORY_RESET: "SaveConnectRegisterItem" = None
-    REG_SET_USER_SAFE_CONFIG: "SaveConnectRegisterItem" = None
-    REG_ACTIVATE_USER_SAFE_CONFIG: "SaveConnectRegisterItem" = None
-    REG_USER_SAFE_CONFIG_VALID: "SaveConnectRegisterItem" = None
-    REG_TIME_AUTO_SUM_WIN: "SaveConnectRegisterItem" = None
-    REG_HOUR_FORMAT: "SaveConnectRegisterItem" = None
-    REG_PIGGYBACK_1_PRESSURE_SAF: "SaveConnectRegisterItem" = None
-    REG_PIGGYBACK_1_PRESSURE_EAF: "SaveConnectRegisterItem" = None
-    REG_PIGGYBACK_1_ENABLED: "SaveConnectRegisterItem" = None
-    REG_PIGGYBACK_1_SAF_COMPENSATION: "SaveConnectRegisterItem" = None
-    REG_PIGGYBACK_1_EAF_COMPENSATION: "SaveConnectRegisterItem" = None
-    REG_USERMODE_DUMMY_MANUAL: "SaveConnectRegisterItem" = None
+    Only registers that the device has reported are stored, each as a small value slot pointing at register
+    metadata that is interned in a SaveConnectMetadataCache and shared between devices. Polls only update the
+    values. Attribute access such as registry.REG_TC_SP returns the slot, known registers that have not been
+    reported read as None.
+    """
+    __slots__ = ("_items", "_cache", "_refresh")
+
+    """Names of all known registers"""
+    names = frozenset(k for k in vars(Register) if k.isupper())
+
+    """Set by metadata.py to avoid a circular import"""
+    default_cache: typing.Any = None
+
+    def __init__(self, cache=None, **items):
+        object.__setattr__(self, "_items", dict())
+        object.__setattr__(self, "_cache", cache)
+        object.__setattr__(self, "_refresh", False)
+        for k, v in items.items():
+            setattr(self, k, v)
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else self.default_cache
+
+    def ingest(self, raw_items: typing.Dict[str, dict], timestamp=None,
+               metas: typing.Dict[str, typing.Any] = None) -> typing.List[typing.Tuple[str, typing.Any, typing.Any]]:
+        """
+        Apply raw dataItems to the registry. Metadata is only parsed for registers that have not been seen before,
+        known registers only get their value updated.
+        @param raw_items: mapping of register name to dataItem
+        @param timestamp: time the values were received, defaults to now
+        @param metas: optional mapping of register name to the already interned metadata of new registers
+        @return: list of (name, slot, old value) for every applied item
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        items = self._items
+        cache = self.cache
+        refresh = self._refresh
+        applied = []
+        for name, raw in raw_items.items():
+            slot = items.get(name)
+            if slot is None:
+                meta = metas.get(name) if metas else None
+                if meta is not None:
+                    slot = items[name] = cache.value_type(meta, raw.get("value"), timestamp)
+                else:
+                    slot = items[name] = cache.slot(raw, timestamp)
+                applied.append((name, slot, None))
+                continue
+
+            old_value = slot.value
+            if refresh:
+                slot.meta = cache.intern(raw)
+            slot.value = raw.get("value")
+            slot.updated_at = timestamp
+            applied.append((name, slot, old_value))
+
+        if refresh:
+            object.__setattr__(self, "_refresh", False)
+        return applied
+
+    def ingest_values(self, values: typing.List[typing.Tuple[str, typing.Any]],
+                      timestamp=None) -> typing.Optional[typing.List[typing.Tuple[str, typing.Any, typing.Any]]]:
+        """
+        Apply values of registers whose metadata is already known, without touching the metadata
+        @param values: list of (name, value)
+        @param timestamp: time the values were received, defaults to now
+        @return: list of (name, slot, old value) like ingest(), None without applying anything if a register is new or
+        the metadata is to be refreshed, i.e. the full dataItems are needed
+        """
+        items = self._items
+        if self._refresh:
+            return None
+        try:
+            slots = [items[name] for name, _ in values]
+        except KeyError:
+            return None
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        applied = []
+        for slot, (name, value) in zip(slots, values):
+            applied.append((name, slot, slot.value))
+            slot.value = value
+            slot.updated_at = timestamp
+        return applied
+
+    def values(self, names: typing.Iterable[str], engineering=True) -> typing.List[typing.Any]:
+        """
+        Bulk read of register values
+        @param names: register names
+        @param engineering: scale numeric values by the register decimals
+        @return: the values in the order of names, None for registers that have not been reported
+        """
+        items = self._items
+        slots = [items.get(name) for name in names]
+        if not engineering:
+            return [slot.value if slot is not None else None for slot in slots]
+        if np is not None:
+            return [None if value != value else value for value in self._scaled(slots).tolist()]
+        return [slot.engineering_value if slot is not None else None for slot in slots]
+
+    def values_array(self, names: typing.Iterable[str], engineering=True) -> "np.ndarray":
+        """
+        Bulk read of register values into a float64 array. Requires numpy.
+        @param names: register names
+        @param engineering: scale the values by the register decimals, with one multiplication of the whole array
+        @return: the values in the order of names, NaN for registers that have not been reported or are not numeric
+        """
+        if np is None:
+            raise ImportError("SaveConnectRegistry.values_array requires numpy. "
+                              "Install python-systemair-saveconnect[fleet].")
+        items = self._items
+        slots = [items.get(name) for name in names]
+        if not engineering:
+            return self._raw(slots)
+        return self._scaled(slots)
+
+    @staticmethod
+    def _raw(slots) -> "np.ndarray":
+        raw = [slot.value if slot is not None else None for slot in slots]
+        try:
+            # None becomes NaN, numeric strings are parsed by numpy
+            return np.array(raw, dtype=np.float64)
+        except (TypeError, ValueError):
+            values = np.full(len(raw), np.nan)
+            for i, value in enumerate(raw):
+                try:
+                    values[i] = float(value)
+                except (TypeError, ValueError):
+                    pass
+            return values
+
+    def _scaled(self, slots) -> "np.ndarray":
+        scales = np.array([slot.meta.scale if slot is not None else np.nan for slot in slots], dtype=np.float64)
+        return self._raw(slots) * scales
+
+    def assign(self, name, meta, value, timestamp=None) -> typing.Tuple[str, typing.Any, typing.Any]:
+        """
+        Set a value with the given metadata, e.g. for derived registers that are not reported by the device
+        @return: (name, slot, old value)
+        """
+        slot = self._items.get(name)
+        if slot is None:
+            slot = self.cache.value_type(meta, value, timestamp)
+            setattr(self, name, slot)
+            return name, slot, None
+
+        old_value = slot.value
+        slot.meta = meta
+        slot.value = value
+        slot.updated_at = timestamp if timestamp is not None else time.time()
+        return name, slot, old_value
+
+    def touch(self, names: typing.Iterable[str], timestamp=None):
+        """
+        Mark values as confirmed unchanged at timestamp
+        @param names: register names
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        items = self._items
+        for name in names:
+            slot = items.get(name)
+            if slot is not None:
+                slot.updated_at = timestamp
+
+    @classmethod
+    def add_name(cls, name):
+        """
+        Allow a register name that is not part of Register, e.g. a derived metric
+        """
+        cls.names = cls.names | {name}
+
+    def refresh_metadata(self):
+        """
+        Re-read the metadata of every register on the next update, e.g. after a firmware upgrade
+        """
+        object.__setattr__(self, "_refresh", True)
+
+    def __reduce__(self):
+        return copyreg.__newobj__, (type(self),), (self._items, self._cache, self._refresh)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __deepcopy__(self, memo):
+        # The metadata cache is an interning pool shared between registries, only the values are copied
+        registry = type(self)(cache=self._cache)
+        object.__setattr__(registry, "_items", copy.deepcopy(self._items, memo))
+        object.__setattr__(registry, "_refresh", self._refresh)
+        return registry
+
+    def __getattr__(self, name):
+        # Only called for missing attributes. The slots are missing while copy and pickle build the registry.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._items[name]
+        except KeyError:
+            pass
+
+        if name in self.names:
+            return None
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        if name not in self.names:
+            raise AttributeError(f"'{name}' is not a known register")
+
+        if isinstance(value, dict):
+            self.ingest({name: value})
+        elif value is None:
+            self._items.pop(name, None)
+        else:
+            self._items[name] = value
+
+    def __delattr__(self, name):
+        setattr(self, name, None)
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self):
+        return list(self._items)
+
+    def items(self):
+        return list(self._items.items())
+
+    def dict(self):
+        return {name: item.dict() for name, item in self._items.items()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} registers)"
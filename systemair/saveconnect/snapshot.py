@@ -0,0 +1,189 @@
+"""
+Snapshot and restore of SaveConnectData.
+
+A snapshot holds the devices, the interned register metadata and every register value together with the time it
+was received. Restored values keep their original timestamps, so SaveConnectRegisterValue.age tells how stale they
+are until the next poll replaces them.
+
+Layout (little endian):
+    b"SCSNAP" | version u8 | created f64 | n_sections u32 | n_sections * (length u32 | zlib compressed section)
+
+The first section is the metadata table (JSON), the second the device list (JSON), followed by one packed
+register section per device holding (metadata index u32 | updated_at f64 | kind u8 | value) records.
+"""
+import json
+import logging
+import os
+import struct
+import time
+import typing
+import zlib
+
+from .data import SaveConnectData
+from .metadata import STATIC_FIELDS, SaveConnectRegisterValue
+from .models import SaveConnectDevice
+from .register import Register, SaveConnectRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"SCSNAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<6sBdI")
+_LENGTH = struct.Struct("<I")
+_RECORD = struct.Struct("<Id")
+
+_NONE, _INT, _FLOAT, _STR, _BOOL, _JSON = range(6)
+_INT_VALUE = struct.Struct("<q")
+_FLOAT_VALUE = struct.Struct("<d")
+_BOOL_VALUE = struct.Struct("<?")
+
+_DEVICE_EXCLUDE = {"registry", "cb", "cb_budgets"}
+
+
+def _pack_value(value) -> bytes:
+    if value is None:
+        return bytes([_NONE])
+    if isinstance(value, bool):
+        return bytes([_BOOL]) + _BOOL_VALUE.pack(value)
+    if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        return bytes([_INT]) + _INT_VALUE.pack(value)
+    if isinstance(value, float):
+        return bytes([_FLOAT]) + _FLOAT_VALUE.pack(value)
+
+    kind, encoded = (_STR, value.encode()) if isinstance(value, str) else (_JSON, json.dumps(value).encode())
+    return bytes([kind]) + _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_value(kind, buffer, offset):
+    if kind == _NONE:
+        return None, offset
+    if kind == _INT:
+        return _INT_VALUE.unpack_from(buffer, offset)[0], offset + _INT_VALUE.size
+    if kind == _FLOAT:
+        return _FLOAT_VALUE.unpack_from(buffer, offset)[0], offset + _FLOAT_VALUE.size
+    if kind == _BOOL:
+        return _BOOL_VALUE.unpack_from(buffer, offset)[0], offset + _BOOL_VALUE.size
+
+    length, = _LENGTH.unpack_from(buffer, offset)
+    offset += _LENGTH.size
+    encoded = bytes(buffer[offset:offset + length])
+    return (encoded.decode() if kind == _STR else json.loads(encoded)), offset + length
+
+
+def dumps(data: SaveConnectData) -> bytes:
+    """
+    Serialize the devices and registries of a SaveConnectData
+    @param data: the SaveConnectData to serialize
+    @return: the snapshot
+    """
+    metadata = []
+    meta_index = dict()
+    devices = []
+    register_sections = []
+
+    for device in data.devices.values():
+        devices.append(device.dict(exclude=_DEVICE_EXCLUDE))
+        records = []
+        for _, slot in (device.registry.items() if device.registry is not None else []):
+            index = meta_index.get(id(slot.meta))
+            if index is None:
+                index = meta_index[id(slot.meta)] = len(metadata)
+                metadata.append(slot.meta.dict())
+            records.append(_RECORD.pack(index, slot.updated_at) + _pack_value(slot.value))
+        register_sections.append(b"".join(records))
+
+    sections = [json.dumps(metadata).encode(), json.dumps(devices).encode()] + register_sections
+    sections = [zlib.compress(section) for section in sections]
+    return b"".join(
+        [_HEADER.pack(MAGIC, VERSION, time.time(), len(sections))] +
+        [_LENGTH.pack(len(section)) + section for section in sections]
+    )
+
+
+def loads(data: SaveConnectData, snapshot: bytes) -> typing.List[SaveConnectDevice]:
+    """
+    Restore devices and registries from a snapshot. Devices that are already known are left untouched.
+    @param data: the SaveConnectData to restore into
+    @param snapshot: the snapshot from dumps()
+    @return: the restored devices
+    """
+    magic, version, created, n_sections = _HEADER.unpack_from(snapshot, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported snapshot (magic={magic!r}, version={version})")
+
+    offset = _HEADER.size
+    sections = []
+    for _ in range(n_sections):
+        length, = _LENGTH.unpack_from(snapshot, offset)
+        offset += _LENGTH.size
+        sections.append(zlib.decompress(snapshot[offset:offset + length]))
+        offset += length
+
+    metadata = []
+    for meta in json.loads(sections[0]):
+        raw = {field: meta[field] for field in STATIC_FIELDS}
+        raw["register"] = meta["register_"]
+        raw["value"] = meta["defaultValue"]
+        metadata.append(data.metadata.intern(raw))
+
+    restored = []
+    for device_data, records in zip(json.loads(sections[1]), sections[2:]):
+        if device_data["identifier"] in data.devices:
+            continue
+
+        registry = SaveConnectRegistry(cache=data.metadata)
+        position = 0
+        while position < len(records):
+            index, updated_at = _RECORD.unpack_from(records, position)
+            position += _RECORD.size
+            value, position = _unpack_value(records[position], records, position + 1)
+            meta = metadata[index]
+            name = Register.map.get(str(meta.register_))
+            if name is not None:
+                setattr(registry, name, SaveConnectRegisterValue(meta, value, updated_at))
+
+        restored.append(SaveConnectDevice.parse_obj({**device_data, "registry": registry}))
+
+    # Only added once the whole snapshot was read, so a corrupt snapshot does not leave some of its devices behind
+    for device in restored:
+        data.devices[device.identifier] = device
+
+    _LOGGER.debug(f"Restored {len(restored)} devices from a snapshot that is {time.time() - created:.0f}s old.")
+    return restored
+
+
+def save(data: SaveConnectData, path):
+    """
+    Write a snapshot to disk. The file is replaced atomically.
+    @param data:
+    @param path:
+    """
+    write(dumps(data), path)
+
+
+def write(snapshot: bytes, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(snapshot)
+    os.replace(tmp_path, path)
+
+
+def load(data: SaveConnectData, path) -> typing.List[SaveConnectDevice]:
+    """
+    Restore a snapshot from disk. A snapshot that cannot be read, e.g. truncated, corrupt or of another version, is
+    logged and ignored, so the client starts cold.
+    @param data:
+    @param path:
+    @return: the restored devices, empty if there is no usable snapshot
+    """
+    if not os.path.exists(path):
+        return []
+
+    try:
+        with open(path, "rb") as f:
+            return loads(data, f.read())
+    except (OSError, ValueError, struct.error, zlib.error, KeyError, IndexError, TypeError,
+            json.JSONDecodeError) as e:
+        _LOGGER.warning(f"Ignoring unusable snapshot {path}: {e!r}")
+        return []
@@ -0,0 +1,206 @@
+"""
+SQLite history backend.
+
+SaveConnectSQLiteHistory is a SaveConnectData sink for deployments without a time-series database. Applied register
+values are appended to a bounded in-memory buffer and written by a background thread with batched executemany
+inserts, so the update path never waits for the disk.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS register_history (
+    device_id TEXT NOT NULL,
+    register INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    value NUMERIC,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS register_history_device_register_time
+    ON register_history (device_id, register, timestamp);
+"""
+
+
+def _column_value(value):
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value)
+
+
+class SaveConnectSQLiteStats:
+
+    def __init__(self):
+        self.buffered = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.errors = 0
+        self.last_flush_rows = 0
+        self.last_flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    def dict(self):
+        return dict(vars(self))
+
+
+class SaveConnectSQLiteHistory:
+
+    def __init__(self, path, batch_size=1000, flush_interval=1.0, max_buffer=100000, changes_only=False):
+        """
+        SQLite history sink. Add it to SaveConnectData with add_sink() and close() it on shutdown.
+        @param path: the database file
+        @param batch_size: number of buffered rows that triggers a flush before flush_interval has passed
+        @param flush_interval: maximum seconds between flushes
+        @param max_buffer: maximum number of buffered rows, further rows are dropped and counted
+        @param changes_only: only store registers whose value changed
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.changes_only = changes_only
+        self.stats = SaveConnectSQLiteStats()
+
+        self._buffer: typing.List[tuple] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._local = threading.local()
+
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.commit()
+
+        self._thread = threading.Thread(target=self._writer, name="saveconnect-sqlite", daemon=True)
+        self._thread.start()
+
+    def on_update(self, device_id, changes, timestamp, source):
+        rows = [
+            (device_id, c.register, timestamp, _column_value(c.new), source)
+            for c in changes if not self.changes_only or c.changed
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            space = self.max_buffer - len(self._buffer)
+            if space < len(rows):
+                self.stats.dropped += len(rows) - max(space, 0)
+                rows = rows[:max(space, 0)]
+            self._buffer.extend(rows)
+            self.stats.buffered = len(self._buffer)
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Wake the writer thread to write the buffer now
+        """
+        self._wakeup.set()
+
+    def close(self, timeout=None):
+        """
+        Write the remaining buffer and stop the writer thread
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def query(self, device_id, register, start=None, end=None) -> typing.List[typing.Tuple[float, typing.Any]]:
+        """
+        Stored samples of a register
+        @param device_id:
+        @param register: register address
+        @param start: include samples with timestamp >= start
+        @param end: include samples with timestamp < end
+        @return: list of (timestamp, value)
+        """
+        sql, params = self._range("SELECT timestamp, value FROM register_history", device_id, register, start, end)
+        return self._connect().execute(sql + " ORDER BY timestamp", params).fetchall()
+
+    def downsample(self, device_id, register, bucket, start=None, end=None) -> typing.List[tuple]:
+        """
+        Aggregate the samples of a register into fixed time buckets
+        @param device_id:
+        @param register: register address
+        @param bucket: bucket width in seconds
+        @param start: include samples with timestamp >= start
+        @param end: include samples with timestamp < end
+        @return: list of (bucket start, mean, min, max, count)
+        """
+        sql, params = self._range(
+            "SELECT CAST(timestamp / ? AS INTEGER) * ? AS bucket, AVG(value), MIN(value), MAX(value), COUNT(*) "
+            "FROM register_history", device_id, register, start, end
+        )
+        sql += " GROUP BY bucket ORDER BY bucket"
+        return self._connect().execute(sql, [bucket, bucket] + params).fetchall()
+
+    @staticmethod
+    def _range(select, device_id, register, start, end):
+        sql = select + " WHERE device_id = ? AND register = ?"
+        params = [device_id, int(register)]
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND timestamp < ?"
+            params.append(end)
+        return sql, params
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        @return: the connection of the calling thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _writer(self):
+        connection = self._connect()
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                self.stats.buffered = 0
+
+            if rows:
+                self._write(connection, rows)
+
+            if self._stopped.is_set():
+                with self._lock:
+                    remaining, self._buffer = self._buffer, []
+                if remaining:
+                    self._write(connection, remaining)
+                connection.close()
+                return
+
+    def _write(self, connection, rows):
+        start = time.perf_counter()
+        try:
+            with connection:
+                connection.executemany("INSERT INTO register_history VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            self.stats.errors += 1
+            _LOGGER.error(f"Could not write {len(rows)} rows to {self.path}. Error: {e}")
+            return
+
+        elapsed = time.perf_counter() - start
+        self.stats.written += len(rows)
+        self.stats.flushes += 1
+        self.stats.last_flush_rows = len(rows)
+        self.stats.last_flush_time = elapsed
+        self.stats.max_flush_time = max(self.stats.max_flush_time, elapsed)
@@ -2,16 +2,22 @@
 python-systemair-saveconnect is a module for accessing the saveconnect HTTP/WS api to retrieve and write data.
 """
 import asyncio
-import json
 import logging
+import random
 import time
 import typing
 
+from . import snapshot
 from .auth import SaveConnectAuth
-from .const import Airflow, UserModes
+from .callbacks import SaveConnectCallbackDispatcher
+from .codec import get_codec
+from .const import Airflow, APIRoutes, UpdateSource, UserModes
 from .data import SaveConnectData
 from .graphql import SaveConnectGraphQL
 from .models import SaveConnectDevice
+from .notifications import Notification, SaveConnectNotifications
+from .planner import SaveConnectRoutePlanner
+from .poll import ACCOUNT, SaveConnectPollPolicy, SaveConnectScheduler
 from .register import Register
 from .registry import RegisterWrite
 from .websocket import WSClient
@@ -44,13 +50,14 @@ class SaveConnectTemperature:
         @param device:
         @param temperature: the specified temperature
         """
-        min_value = int(device.registry.REG_TC_SP["min"] / 10)
-        max_value = int(device.registry.REG_TC_SP["max"] / 10)
+        setpoint = device.registry.REG_TC_SP
+        min_value = setpoint.min * setpoint.scale
+        max_value = setpoint.max * setpoint.scale
 
         if min_value <= temperature <= max_value:
             await self.sc.write_data(
                 device=device,
-                register=RegisterWrite(register=Register.REG_TC_SP, value=int(temperature * 10))
+                register=RegisterWrite(register=Register.REG_TC_SP, value=int(round(temperature / setpoint.scale)))
             )
         else:
             raise RuntimeWarning(
@@ -118,7 +125,16 @@ class SaveConnect:
                  refresh_token_interval=300,
                  worker_interval=5,
                  loop=asyncio.get_event_loop(),
-                 http_retries=10
+                 http_retries=10,
+                 callback_concurrency=8,
+                 callback_budget=0.5,
+                 snapshot_path=None,
+                 snapshot_interval=300,
+                 poll_policy: SaveConnectPollPolicy = None,
+                 adaptive_polling=False,
+                 json_codec=None,
+                 parse_executor=None,
+                 parse_offload_threshold=65536
                  ):
         """
         Constructor of the SaveConnect API
@@ -130,12 +146,36 @@ class SaveConnect:
         @param update_interval: interval of how often to update via REST API
         @param refresh_token_interval: Refresh interval of the access_token
         @param http_retries: Number of times a http request is retried
+        @param callback_concurrency: Maximum number of coroutine update callbacks running at the same time
+        @param callback_budget: Time budget (seconds) of a single update callback call before it counts as slow
+        @param snapshot_path: optional file to warm-start devices from and to periodically save their state to
+        @param snapshot_interval: interval of how often to save the snapshot
+        @param poll_policy: optional per-route poll cadence. Polls every route each update_interval if None
+        @param adaptive_polling: back off polling of stable and WebSocket pushing devices
+        @param json_codec: JSON codec of HTTP and WebSocket payloads, one of json, orjson or msgspec. The fastest
+        installed codec if None
+        @param parse_executor: executor decoding large responses, e.g. a ProcessPoolExecutor. The loop's default
+        executor if None
+        @param parse_offload_threshold: size in bytes from which responses are decoded in parse_executor, None to
+        always decode on the loop
         """
 
         self._http_retries = http_retries
-
-        self.data = SaveConnectData()
+        self.codec = get_codec(json_codec)
+
+        self.planner = SaveConnectRoutePlanner()
+        self.data = SaveConnectData(
+            dispatcher=SaveConnectCallbackDispatcher(
+                loop=loop,
+                max_concurrency=callback_concurrency,
+                budget=callback_budget
+            )
+        )
+        self.notifications = SaveConnectNotifications(self.data)
         self.graphql = SaveConnectGraphQL(self)
+        self.graphql.executor = parse_executor
+        self.graphql.offload_threshold = parse_offload_threshold
+        self.data.add_sink(self.graphql)
         self.auth = SaveConnectAuth(self)
         self.user_mode = SaveConnectUserMode(self)
         self.temperature = SaveConnectTemperature(self)
@@ -157,6 +197,12 @@ class SaveConnect:
         """Device sensor update interval."""
         self.update_interval = update_interval
 
+        """Per-route poll cadence and the resulting schedule"""
+        self.poll_policy = poll_policy or SaveConnectPollPolicy(default_interval=update_interval)
+        self.scheduler = SaveConnectScheduler.adaptive(self.poll_policy) if adaptive_polling \
+            else SaveConnectScheduler(self.poll_policy)
+        self.data.add_sink(self.scheduler)
+
         """The tick speed of the worker loop"""
         self.worker_interval = worker_interval
 
@@ -166,6 +212,13 @@ class SaveConnect:
         """The asyncio loop"""
         self.loop = loop
 
+        """Snapshot of the device state"""
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+
+        """Devices restored from the snapshot that have not been revalidated against the API yet"""
+        self.restored_devices = snapshot.load(self.data, snapshot_path) if snapshot_path else []
+
         """Run async loop for updating sensors and refresh token."""
         loop.create_task(self.worker())
 
@@ -174,18 +227,16 @@ class SaveConnect:
         return self._http_retries
 
     async def worker(self):
-        last_update_time = time.time()
+        # Wake up at a random point of the worker interval, so clients started together do not poll together.
+        await asyncio.sleep(random.uniform(0, self.worker_interval))
+
         last_refresh_token_time = time.time()
+        last_snapshot_time = time.time()
         while True:
             now = time.time()
 
             if self.auth.is_auth():
-                if 0 < self.update_interval < now - last_update_time:
-                    _LOGGER.debug("Updating data according to update_interval.")
-                    for device in await self.get_devices():
-                        await self.read_data(device=device)
-
-                    last_update_time = time.time()
+                await self.poll_due(now)
 
                 if 0 < self.refresh_token_interval < now - last_refresh_token_time:
                     _LOGGER.debug("Refreshing access tokens")
@@ -193,8 +244,28 @@ class SaveConnect:
 
                     last_refresh_token_time = time.time()
 
+            if self.snapshot_path and 0 < self.snapshot_interval < now - last_snapshot_time:
+                await self.save_snapshot()
+                last_snapshot_time = time.time()
+
             await asyncio.sleep(self.worker_interval)
 
+    async def save_snapshot(self):
+        """
+        Save the device state to snapshot_path. Serialization runs on the loop, the file is written in an executor.
+        """
+        _LOGGER.debug(f"Saving snapshot to {self.snapshot_path}")
+        await self.loop.run_in_executor(None, snapshot.write, snapshot.dumps(self.data), self.snapshot_path)
+
+    async def revalidate(self):
+        """
+        Refresh devices that were restored from a snapshot
+        """
+        _LOGGER.debug(f"Revalidating {len(self.restored_devices)} devices restored from snapshot.")
+        for device in await self.get_devices():
+            await self.read_data(device=device)
+        self.restored_devices = []
+
     async def refresh_token(self):
         _LOGGER.debug("Refreshing access tokens")
         await self.auth.refresh_token()
@@ -212,6 +283,8 @@ class SaveConnect:
                 self._ws.set_access_token(self.auth.token)
                 self.loop.create_task(self._ws.connect())
             self.graphql.set_access_token(self.auth.token)
+            if self.restored_devices:
+                self.loop.create_task(self.revalidate())
         return success
 
     async def on_ws_data(self, data) -> bool:
@@ -219,28 +292,32 @@ class SaveConnect:
         Callback for retrieving DEVICE_PUSH_EVENT's via websockets
         @param data: the raw data from the WSS API
         """
-        data_json = json.loads(data)
+        data_json = self.codec.loads(data)
         payload = data_json["payload"]
         device_id = payload["deviceId"]
         message_type = data_json["type"]
 
         if message_type == "DEVICE_CONNECTED":
             self.data.set_availability(device_id, available=True)
+            self.scheduler.online(device_id, time.time())
         elif message_type == "DEVICE_DISCONNECTED":
             self.data.set_availability(device_id, available=False)
+            self.scheduler.offline(device_id, time.time())
         elif message_type == "DEVICE_PUSH_EVENT":
             if "dataItems" not in payload:
                 _LOGGER.warning("Could not retrieve dataItems from websocket API.")
                 return False
 
             data_items = payload["dataItems"]
-            self.data.update(device_id, data_items)
+            self.data.update(device_id, data_items, source=UpdateSource.WS)
 
             # Finally poll for updates
 
             try:
                 device = self.data.get_device(device_id=device_id)
+                self.scheduler.polling(device_id)
                 await self.read_data(device=device)
+                self.scheduler.mark(device_id, APIRoutes.HOME, time.time())
             except KeyError:
                 _LOGGER.debug(f"Could not find device with ID={device_id} when polling data in WS.")
         else:
@@ -249,6 +326,83 @@ class SaveConnect:
 
         return True
 
+    def set_interest(self, registers: typing.Optional[typing.Iterable[int]]):
+        """
+        Declare the registers that need to be kept up to date. The worker then only polls the routes that cover them.
+        @param registers: Register addresses, None to poll all routes
+        """
+        self.planner.set_interest(registers)
+
+    async def poll_device(self, device: SaveConnectDevice) -> bool:
+        """
+        Poll the routes planned by the route planner
+        @param device: SaveConnectDevice object
+        @return: success
+        """
+        if not self.auth.is_auth():
+            await self.refresh_token()
+
+        statuses = []
+        for route in self.planner.plan(device.identifier):
+            status = await self.graphql.queryDeviceView(device.identifier, route)
+            if not status:
+                _LOGGER.error(f"Polling failed for route={route}")
+            statuses.append(status)
+
+        return all(statuses)
+
+    async def poll_due(self, now) -> int:
+        """
+        Poll the account and the device routes that are due according to the poll policy. Offline devices are only
+        probed.
+        @param now: current time
+        @return: number of requests made
+        """
+        requests = 0
+        if self.scheduler.due(ACCOUNT, [ACCOUNT], now):
+            _LOGGER.debug("Refreshing the device list according to the poll policy.")
+            await self.get_devices(fetch_device_info=False)
+            self.scheduler.mark(ACCOUNT, ACCOUNT, time.time())
+            requests += 1
+
+        due = []
+        probes = []
+        for device_id, device in list(self.data.devices.items()):
+            routes = self.planner.plan(device_id)
+            if device.connectionStatus == "OFFLINE":
+                self.scheduler.offline(device_id, now)
+            elif self.scheduler.is_offline(device_id):
+                self.scheduler.online(device_id, now)
+
+            if self.scheduler.is_offline(device_id):
+                self.scheduler.skip(device_id, self.scheduler.due(device_id, routes, now), now)
+                if self.scheduler.probe_due(device_id, now):
+                    probes.append(device_id)
+                continue
+
+            for route in self.scheduler.due(device_id, routes, now):
+                due.append((self.poll_policy.rule(route).priority, device_id, route))
+        due.sort(key=lambda item: -item[0])
+
+        for device_id in probes:
+            start = time.time()
+            status = await self.graphql.queryDeviceView(device_id, APIRoutes.HOME)
+            end = time.time()
+            if status:
+                self.data.set_availability(device_id, available=True)
+            self.scheduler.probed(device_id, end, status, end - start)
+            requests += 1
+
+        for _, device_id, route in due:
+            self.scheduler.polling(device_id)
+            status = await self.graphql.queryDeviceView(device_id, route)
+            if not status:
+                _LOGGER.error(f"Polling failed for device={device_id} route={route}")
+            self.scheduler.mark(device_id, route, time.time())
+            requests += 1
+
+        return requests
+
     async def read_data(self, device: SaveConnectDevice) -> bool:
         """
         Read all registers on a specific device
@@ -294,6 +448,16 @@ class SaveConnect:
 
         return devices
 
+    async def get_notifications(self, update=False) -> typing.List[Notification]:
+        """
+        Notifications of the account
+        @param update: fetch every notification of the account instead of returning the stored unread and recent ones
+        @return: the notifications, newest first
+        """
+        if update:
+            return await self.graphql.queryNotifications()
+        return self.notifications.items()
+
     async def update_device_info(self, devices):
         for device in devices:
             await self.graphql.queryDeviceInfo(device)
@@ -0,0 +1,91 @@
+"""
+Typed decoding of GetDeviceView responses.
+
+Requires the optional msgspec dependency (pip install python-systemair-saveconnect[msgspec]). The response bytes are
+decoded in a single pass into DataItemValue structs holding only the register address and value. The metadata of
+every dataItem is skipped by the decoder instead of being built into dicts, as it is already interned in the registry
+after the first poll. Responses the structs do not fit are left to the regular dict path. The decoder can be pickled,
+so it can be used in a process pool.
+"""
+import logging
+import typing
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from .register import Register
+
+_LOGGER = logging.getLogger(__name__)
+
+if msgspec is not None:
+    class DataItemValue(msgspec.Struct):
+        register: int
+        value: typing.Any = None
+
+    class _DeviceView(msgspec.Struct):
+        dataItems: typing.Optional[typing.List[DataItemValue]] = None
+
+    class _DeviceViewData(msgspec.Struct):
+        GetDeviceView: typing.Optional[_DeviceView] = None
+
+    class _DeviceViewResponse(msgspec.Struct):
+        data: typing.Optional[_DeviceViewData] = None
+
+
+class SaveConnectViewDecoder:
+
+    def __init__(self):
+        """
+        Decoder of GetDeviceView responses into DataItemValue structs
+        """
+        if msgspec is None:
+            raise ImportError("SaveConnectViewDecoder requires msgspec. Install python-systemair-saveconnect[msgspec].")
+        self._decoder = msgspec.json.Decoder(_DeviceViewResponse)
+        self._names: typing.Dict[int, str] = dict()
+
+    def __reduce__(self):
+        return self.__class__, ()
+
+    def decode(self, content: bytes) -> typing.Optional[typing.List["DataItemValue"]]:
+        """
+        @param content: raw GetDeviceView response
+        @return: the dataItems, None if the response has no dataItems or does not fit the structs, e.g. an error
+        """
+        try:
+            response = self._decoder.decode(content)
+        except msgspec.DecodeError:
+            return None
+        if response.data is None or response.data.GetDeviceView is None:
+            return None
+        return response.data.GetDeviceView.dataItems
+
+    def decode_values(self, content: bytes) -> typing.Optional[typing.Tuple[typing.List[int], typing.List[tuple]]]:
+        """
+        Decode a response and map its registers to Register names, see SaveConnectData.update_values()
+        @param content: raw GetDeviceView response
+        @return: (register addresses, list of (name, value) of the known registers), None like decode()
+        """
+        items = self.decode(content)
+        if items is None:
+            return None
+
+        names = self._names
+        values = []
+        for item in items:
+            name = names.get(item.register)
+            if name is None:
+                name = Register.map.get(str(item.register))
+                if name is None:
+                    continue
+                names[item.register] = name
+            values.append((name, item.value))
+        return [item.register for item in items], values
+
+
+def get_view_decoder() -> typing.Optional[SaveConnectViewDecoder]:
+    """
+    @return: a SaveConnectViewDecoder, None if msgspec is not installed
+    """
+    return SaveConnectViewDecoder() if msgspec is not None else None
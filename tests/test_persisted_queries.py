@@ -0,0 +1,122 @@
+import asyncio
+import json
+import unittest
+
+from systemair.saveconnect.const import APIRoutes
+from systemair.saveconnect.systemair import SaveConnect
+
+from scripts.demo_persisted_queries import PersistedQueryServer, error
+from scripts.payloads import account_response, load_device_view
+
+ACCOUNT = account_response(n_devices=2, n_notifications=0)
+VIEW = load_device_view(None, n_registers=20)
+
+
+def gateway(request, headers):
+    return ACCOUNT if "GetAccount" in request["query"] else VIEW
+
+
+class RecordingServer(PersistedQueryServer):
+
+    def __init__(self, handler, mode):
+        super().__init__(handler, mode=mode)
+        self.received = []
+
+    def _respond(self, request, headers):
+        self.received.append(request)
+        return super()._respond(request, headers)
+
+
+class PersistedQueryTest(unittest.IsolatedAsyncioTestCase):
+
+    async def start(self, mode, handler=gateway):
+        self.server = await RecordingServer(handler, mode=mode).start()
+        self.addAsyncCleanup(self.server.close)
+        self.received = self.server.received
+
+        sc = SaveConnect("test@example.com", "", ws_enabled=False, update_interval=0, refresh_token_interval=0,
+                         loop=asyncio.get_event_loop())
+        sc.graphql.api_url = self.server.url
+        sc.graphql.set_access_token({"access_token": "test"})
+        sc.graphql.persisted_queries = True
+        return sc
+
+    async def test_hit_after_registration(self):
+        sc = await self.start("supported")
+
+        self.assertEqual(len(await sc.get_devices(fetch_device_info=False)), 2)
+        self.assertEqual(len(await sc.get_devices(fetch_device_info=False)), 2)
+
+        # Miss with the hash, registration with the document, hit with the hash
+        self.assertEqual(["query" in request for request in self.received], [False, True, False])
+        self.assertEqual(sc.graphql.stats.persisted_misses, 1)
+        self.assertEqual(sc.graphql.stats.persisted_hits, 1)
+        self.assertTrue(sc.graphql.persisted_queries)
+
+    async def test_reregister_after_server_forgot(self):
+        sc = await self.start("supported")
+        device = (await sc.get_devices(fetch_device_info=False))[0]
+        self.assertTrue(await sc.graphql.queryDeviceView(device.identifier, APIRoutes.HOME))
+
+        self.server.documents.clear()
+        self.received.clear()
+        sc.graphql.skip_unchanged = False
+        self.assertTrue(await sc.graphql.queryDeviceView(device.identifier, APIRoutes.HOME))
+
+        self.assertEqual(["query" in request for request in self.received], [False, True])
+        self.assertEqual(len(self.server.documents), 1)
+        self.assertTrue(sc.graphql.persisted_queries)
+
+    async def test_not_supported_falls_back(self):
+        sc = await self.start("not_supported")
+
+        self.assertEqual(len(await sc.get_devices(fetch_device_info=False)), 2)
+        self.assertFalse(sc.graphql.persisted_queries)
+
+        self.received.clear()
+        self.assertEqual(len(await sc.get_devices(fetch_device_info=False)), 2)
+        self.assertEqual(len(self.received), 1)
+        self.assertNotIn("extensions", self.received[0])
+
+    async def test_unaware_server_falls_back(self):
+        sc = await self.start("unaware")
+
+        self.assertEqual(len(await sc.get_devices(fetch_device_info=False)), 2)
+        self.assertEqual(["query" in request for request in self.received], [False, True])
+        self.assertFalse(sc.graphql.persisted_queries)
+
+    async def test_query_error_keeps_persisted_queries(self):
+        def invalid(request, headers):
+            return error("Cannot query field \"foo\" on type \"Account\".", "GRAPHQL_VALIDATION_FAILED")
+
+        sc = await self.start("supported", handler=invalid)
+        query = {"query": "{ GetAccount { foo } }", "variables": {}}
+
+        for _ in range(2):
+            response = await sc.graphql.post(sc.graphql.api_url, query, sc.graphql.headers)
+            self.assertIn("Cannot query field", json.loads(response.content)["errors"][0]["message"])
+            self.assertTrue(sc.graphql.persisted_queries)
+
+        # The second request is answered from the registered hash and repeated with the document
+        self.assertEqual(["query" in request for request in self.received], [False, True, False, True])
+
+    async def test_query_error_after_hit_is_not_sent_again(self):
+        failing = set()
+
+        def handler(request, headers):
+            if request["query"] in failing:
+                return error("Service temporarily unavailable", "SERVICE_UNAVAILABLE")
+            return gateway(request, headers)
+
+        sc = await self.start("supported", handler=handler)
+        await sc.get_devices(fetch_device_info=False)
+        await sc.get_devices(fetch_device_info=False)
+        self.assertEqual(sc.graphql.stats.persisted_hits, 1)
+
+        failing.update(request["query"] for request in self.received if "query" in request)
+        self.received.clear()
+        self.assertEqual(await sc.get_devices(fetch_device_info=False), [])
+
+        # A transient error answered from the hash is neither repeated with the document nor turns persisted queries off
+        self.assertEqual(["query" in request for request in self.received], [False])
+        self.assertTrue(sc.graphql.persisted_queries)